@@ -1,5 +1,18 @@
 from django.apps import AppConfig
+from django.core.signals import request_started
+from django.db.backends.signals import connection_created
 
 
 class ApiConfig(AppConfig):
     name = 'api'
+
+    def ready(self):
+        import api.checks  # noqa: F401
+        import api.signals  # noqa: F401
+        from api_yamdb.db import check_persistent_connections
+        from api_yamdb.sqlite import apply_sqlite_pragmas
+
+        # Настройки только описывают базы; обработчики соединений
+        # подключаются здесь, а не при импорте settings.py.
+        connection_created.connect(apply_sqlite_pragmas)
+        request_started.connect(check_persistent_connections)
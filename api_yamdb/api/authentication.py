@@ -0,0 +1,123 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+from reviews.models import User
+
+# Поля, которых достаточно для аутентификации и проверки прав. Порядок
+# совпадает с порядком полей модели, как того требует Model.from_db().
+CACHED_USER_FIELDS = tuple(
+    field.attname for field in User._meta.concrete_fields
+    if field.attname in (
+        'id', 'username', 'role', 'is_active', 'is_staff', 'is_superuser'
+    )
+)
+
+
+class UserStateCache:
+    """Ограниченный по размеру LRU-кэш с временем жизни записей.
+
+    Записи лежат в памяти процесса, а поколение пользователя — в общем
+    кэше Django. invalidate() меняет поколение, и записи с прежним
+    поколением перестают использоваться во всех воркерах, а не только в
+    том, где изменили пользователя. Без общего кэша (CACHE_SHARED)
+    записи не используются.
+    """
+
+    generation_prefix = 'jwt-user-generation'
+
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def generation(self, key):
+        """Текущее поколение пользователя или None без общего кэша."""
+        if not getattr(settings, 'CACHE_SHARED', False):
+            # Локальное поколение не узнает о смене роли в другом воркере,
+            # и тот пускал бы пользователя со старыми правами.
+            return None
+        generation_key = f'{self.generation_prefix}:{key}'
+        generation = cache.get(generation_key)
+        if generation is None:
+            # Случайное значение, а не счётчик: после вытеснения ключа из
+            # кэша старые записи не совпадут с новым поколением.
+            cache.add(generation_key, uuid.uuid4().hex, timeout=None)
+            generation = cache.get(generation_key)
+        return generation
+
+    def get(self, key, generation):
+        if generation is None:
+            return None
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            expires, entry_generation, value = entry
+            if expires < time.monotonic() or entry_generation != generation:
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, generation):
+        if generation is None:
+            return
+        with self.lock:
+            self.entries[key] = (
+                time.monotonic() + self.ttl, generation, value
+            )
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, key):
+        cache.set(
+            f'{self.generation_prefix}:{key}', uuid.uuid4().hex, timeout=None
+        )
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+user_cache = UserStateCache(
+    max_size=getattr(settings, 'JWT_USER_CACHE_SIZE', 1024),
+    ttl=getattr(settings, 'JWT_USER_CACHE_TTL', 60),
+)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWT-аутентификация без запроса к таблице пользователей на каждый хит.
+
+    Из кэша собирается экземпляр User с отложенной загрузкой остальных
+    полей: обращение к ним (например, к email) подгрузит их из базы.
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return super().get_user(validated_token)
+        # Поколение читается до базы: если роль сменят между этими
+        # чтениями, запись сохранится со старым поколением и не пригодится.
+        generation = user_cache.generation(user_id)
+        values = user_cache.get(user_id, generation)
+        if values is None:
+            user = super().get_user(validated_token)
+            user_cache.set(
+                user_id,
+                tuple(getattr(user, field) for field in CACHED_USER_FIELDS),
+                generation
+            )
+            return user
+        return User.from_db(DEFAULT_DB_ALIAS, CACHED_USER_FIELDS, values)
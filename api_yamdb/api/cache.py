@@ -0,0 +1,43 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.http import urlencode
+
+RESPONSE_CACHE_PREFIX = 'api-response'
+HITS_KEY = f'{RESPONSE_CACHE_PREFIX}:hits'
+MISSES_KEY = f'{RESPONSE_CACHE_PREFIX}:misses'
+
+
+def get_response_cache():
+    return caches[getattr(settings, 'RESPONSE_CACHE_ALIAS', 'default')]
+
+
+def make_response_cache_key(request, version_name, version):
+    """Ключ из пути, отсортированных параметров запроса и версии ресурса."""
+    query = urlencode(sorted(
+        (key, value)
+        for key, values in request.query_params.lists()
+        for value in values
+    ))
+    digest = hashlib.md5(f'{request.path}?{query}'.encode()).hexdigest()
+    return f'{RESPONSE_CACHE_PREFIX}:{version_name}:{version}:{digest}'
+
+
+def count_response_cache(hit):
+    cache = get_response_cache()
+    key = HITS_KEY if hit else MISSES_KEY
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Счётчика ещё нет или бэкенд ничего не хранит (DummyCache).
+        cache.add(key, 1, timeout=None)
+
+
+def response_cache_stats():
+    cache = get_response_cache()
+    counters = cache.get_many((HITS_KEY, MISSES_KEY))
+    return {
+        'hits': counters.get(HITS_KEY, 0),
+        'misses': counters.get(MISSES_KEY, 0),
+    }
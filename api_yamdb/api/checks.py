@@ -0,0 +1,21 @@
+from django.conf import settings
+from django.core import checks
+
+from api.replicas import get_replicas
+
+
+@checks.register(checks.Tags.caches)
+def check_replica_sticky_cache(app_configs, **kwargs):
+    # Метка «читать с основной базы» лежит в CACHES['default']: в локальном
+    # кэше другой воркер её не увидит и отдаст автору данные с реплики.
+    if not get_replicas() or getattr(settings, 'CACHE_SHARED', False):
+        return []
+    return [checks.Error(
+        'Реплики для чтения требуют общего для всех воркеров кэша.',
+        hint=(
+            'Задайте общий CACHE_URL (memcached, db, file) или '
+            'CACHE_SHARED=1, если приложение работает в одном процессе.'
+        ),
+        obj='REPLICA_DATABASES',
+        id='api.E001',
+    )]
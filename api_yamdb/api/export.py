@@ -0,0 +1,72 @@
+import csv
+import json
+
+from reviews.models import Comment, Review, Title
+
+EXPORT_CHUNK_SIZE = 2000
+
+# Колонки совпадают с файлами static/data, чтобы выгрузку можно было
+# загрузить обратно командой load_csv.
+EXPORT_TABLES = {
+    'titles': (
+        Title,
+        ('id', 'name', 'year', 'category', 'description'),
+        ('id', 'name', 'year', 'category_id', 'description'),
+    ),
+    'review': (
+        Review,
+        ('id', 'title_id', 'text', 'author', 'score', 'pub_date'),
+        ('id', 'title_id', 'text', 'author_id', 'score', 'pub_date'),
+    ),
+    'comments': (
+        Comment,
+        ('id', 'review_id', 'text', 'author', 'pub_date'),
+        ('id', 'review_id_id', 'text', 'author_id', 'pub_date'),
+    ),
+}
+
+EXPORT_CONTENT_TYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson; charset=utf-8',
+}
+
+
+class Echo:
+    """Буфер для csv.writer, который сразу отдаёт записанную строку."""
+
+    def write(self, value):
+        return value
+
+
+def format_value(value):
+    if hasattr(value, 'isoformat'):
+        return value.isoformat(timespec='milliseconds').replace(
+            '+00:00', 'Z'
+        )
+    return value
+
+
+def export_rows(table):
+    model, _, fields = EXPORT_TABLES[table]
+    rows = model.objects.order_by('id').values_list(*fields)
+    for row in rows.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        yield [format_value(value) for value in row]
+
+
+def stream_csv(table):
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_TABLES[table][1])
+    for row in export_rows(table):
+        yield writer.writerow(row)
+
+
+def stream_ndjson(table):
+    columns = EXPORT_TABLES[table][1]
+    for row in export_rows(table):
+        yield json.dumps(dict(zip(columns, row)), ensure_ascii=False) + '\n'
+
+
+EXPORT_STREAMS = {
+    'csv': stream_csv,
+    'ndjson': stream_ndjson,
+}
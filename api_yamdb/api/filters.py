@@ -0,0 +1,55 @@
+from django.db import connections
+from django.db.models import F
+from django_filters import rest_framework as filters
+from rest_framework.filters import OrderingFilter
+
+from reviews.models import Title
+from reviews.search import search_titles
+
+
+class TitleFilter(filters.FilterSet):
+    """Фильтры произведений, объединяемые в один SQL-запрос."""
+
+    genre = filters.CharFilter(field_name='genre__slug')
+    category = filters.CharFilter(field_name='category__slug')
+    year = filters.NumberFilter(field_name='year')
+    year_min = filters.NumberFilter(field_name='year', lookup_expr='gte')
+    year_max = filters.NumberFilter(field_name='year', lookup_expr='lte')
+    name = filters.CharFilter(field_name='name', lookup_expr='icontains')
+    search = filters.CharFilter(method='filter_search')
+
+    class Meta:
+        model = Title
+        fields = ('genre', 'category', 'year', 'name')
+
+    def filter_search(self, queryset, name, value):
+        return search_titles(queryset, value)
+
+
+class NullsLastOrderingFilter(OrderingFilter):
+    """Сортировка, при которой произведения без оценок всегда в конце.
+
+    SQLite и так считает NULL наименьшим значением, а PostgreSQL —
+    наибольшим, поэтому для полей из nullable_fields явно задаётся
+    NULLS LAST при убывании и NULLS FIRST при возрастании. На SQLite
+    Django 2.2 превращает такой модификатор в `rating IS NULL, ...`,
+    что мешает индексу, поэтому там сортировка остаётся обычной.
+    """
+
+    nullable_fields = ('rating', 'weighted_rating')
+
+    def filter_queryset(self, request, queryset, view):
+        ordering = self.get_ordering(request, queryset, view)
+        if not ordering:
+            return queryset
+        if connections[queryset.db].vendor == 'sqlite':
+            return queryset.order_by(*ordering)
+        return queryset.order_by(*map(self.with_nulls, ordering))
+
+    def with_nulls(self, field):
+        name = field.lstrip('-')
+        if name not in self.nullable_fields:
+            return field
+        if field.startswith('-'):
+            return F(name).desc(nulls_last=True)
+        return F(name).asc(nulls_first=True)
@@ -0,0 +1,88 @@
+import bisect
+import threading
+from collections import defaultdict
+
+QUERY_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100)
+TIME_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+
+class RequestMetrics:
+    """Счётчики одного запроса, которые заполняют middleware и миксин."""
+
+    def __init__(self):
+        self.queries = 0
+        self.sql_ms = 0.0
+        self.serializer_ms = 0.0
+        self.render_ms = 0.0
+
+
+class Histogram:
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.total += value
+
+    def as_dict(self):
+        labels = [f'le_{bucket}' for bucket in self.buckets] + ['inf']
+        return {
+            'buckets': dict(zip(labels, self.counts)),
+            'sum': round(self.total, 3),
+        }
+
+
+class EndpointMetrics:
+
+    def __init__(self):
+        self.requests = 0
+        self.queries = Histogram(QUERY_BUCKETS)
+        self.sql_ms = Histogram(TIME_BUCKETS_MS)
+        self.serializer_ms = Histogram(TIME_BUCKETS_MS)
+        self.render_ms = Histogram(TIME_BUCKETS_MS)
+        self.total_ms = Histogram(TIME_BUCKETS_MS)
+
+    def as_dict(self):
+        return {
+            'requests': self.requests,
+            'queries': self.queries.as_dict(),
+            'sql_ms': self.sql_ms.as_dict(),
+            'serializer_ms': self.serializer_ms.as_dict(),
+            'render_ms': self.render_ms.as_dict(),
+            'total_ms': self.total_ms.as_dict(),
+        }
+
+
+class MetricsRegistry:
+    """Гистограммы по имени URL и методу в пределах процесса."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.endpoints = defaultdict(EndpointMetrics)
+
+    def record(self, endpoint, method, metrics, total_ms):
+        with self.lock:
+            stats = self.endpoints[f'{method} {endpoint}']
+            stats.requests += 1
+            stats.queries.observe(metrics.queries)
+            stats.sql_ms.observe(metrics.sql_ms)
+            stats.serializer_ms.observe(metrics.serializer_ms)
+            stats.render_ms.observe(metrics.render_ms)
+            stats.total_ms.observe(total_ms)
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                name: stats.as_dict()
+                for name, stats in sorted(self.endpoints.items())
+            }
+
+    def clear(self):
+        with self.lock:
+            self.endpoints.clear()
+
+
+registry = MetricsRegistry()
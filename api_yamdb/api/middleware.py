@@ -0,0 +1,123 @@
+import logging
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from api.metrics import RequestMetrics, registry
+from api.replicas import (
+    chooser, get_token_user_id, is_sticky, state, stick_to_primary
+)
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(Exception):
+    """Эндпоинт выполнил больше SQL-запросов, чем ему разрешено."""
+
+
+def get_endpoint_name(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return None
+    return match.url_name or match.route or match.view_name
+
+
+def get_query_budget(request, endpoint):
+    budgets = getattr(settings, 'QUERY_BUDGETS', {})
+    budget = budgets.get(f'{request.method} {endpoint}')
+    if budget is None:
+        view_class = getattr(request.resolver_match.func, 'cls', None)
+        budget = getattr(view_class, 'query_budget', None)
+    return budget
+
+
+class QueryMetricsMiddleware:
+    """Считает SQL-запросы и время по эндпоинтам, пишет Server-Timing."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        metrics = request.metrics = RequestMetrics()
+
+        def count_query(execute, sql, params, many, context):
+            started = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                metrics.queries += 1
+                metrics.sql_ms += (time.perf_counter() - started) * 1000
+
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(count_query))
+            response = self.get_response(request)
+        total_ms = (time.perf_counter() - started) * 1000
+
+        response['Server-Timing'] = ', '.join((
+            f'db;dur={metrics.sql_ms:.2f};desc="{metrics.queries} queries"',
+            f'serialize;dur={metrics.serializer_ms:.2f}',
+            f'render;dur={metrics.render_ms:.2f}',
+            f'total;dur={total_ms:.2f}',
+        ))
+        endpoint = get_endpoint_name(request)
+        if endpoint is not None:
+            registry.record(endpoint, request.method, metrics, total_ms)
+            self.check_budget(request, endpoint, metrics)
+        return response
+
+    def check_budget(self, request, endpoint, metrics):
+        budget = get_query_budget(request, endpoint)
+        if budget is None or metrics.queries <= budget:
+            return
+        message = (
+            f'{request.method} {endpoint}: {metrics.queries} SQL-запросов '
+            f'при бюджете {budget}'
+        )
+        if getattr(settings, 'QUERY_BUDGET_RAISE', False):
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
+
+
+class ReplicaMiddleware:
+    """Направляет чтения вьюх приложения api на реплики.
+
+    Безопасные запросы (GET, HEAD, OPTIONS) читают с реплики, выбранной
+    ReplicaChooser. После успешной записи пользователь на
+    PRIMARY_STICKY_SECONDS закрепляется за основной базой, чтобы сразу
+    видеть свои изменения несмотря на отставание реплик.
+    """
+
+    safe_methods = ('GET', 'HEAD', 'OPTIONS')
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.replica_user_id = None
+        try:
+            response = self.get_response(request)
+        finally:
+            alias = getattr(state, 'alias', None)
+            state.alias = None
+            if alias is not None:
+                chooser.release(alias)
+        if (
+            request.method not in self.safe_methods
+            and request.replica_user_id is not None
+            and response.status_code < 400
+        ):
+            stick_to_primary(request.replica_user_id)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not view_func.__module__.startswith('api.'):
+            return None
+        user_id = get_token_user_id(request)
+        request.replica_user_id = user_id
+        if request.method in self.safe_methods and not is_sticky(user_id):
+            state.alias = chooser.acquire()
+        return None
@@ -0,0 +1,139 @@
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework.response import Response
+
+from api.cache import (
+    count_response_cache,
+    get_response_cache,
+    make_response_cache_key
+)
+from reviews.versions import get_version
+
+
+class ResourceVersionMixin:
+    """Счётчик изменений ресурса `version_name`, читаемый раз за запрос."""
+
+    version_name = None
+
+    def get_resource_version(self):
+        if not hasattr(self, '_resource_version'):
+            self._resource_version = get_version(self.version_name)
+        return self._resource_version
+
+
+class ConditionalGetMixin(ResourceVersionMixin):
+    """ETag и Last-Modified для list и retrieve по счётчику изменений.
+
+    Счётчик увеличивается сигналами при записи, поэтому при совпадении
+    If-None-Match ответ 304 отдаётся без обращения к сериализатору.
+    """
+
+    def get_validators(self, request):
+        version, modified = self.get_resource_version()
+        etag = quote_etag(
+            f'{self.version_name}-{version}-{request.accepted_renderer.format}'
+        )
+        return etag, modified
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        etag, modified = self.get_validators(request)
+        last_modified = modified.timestamp() if modified else None
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        if 200 <= response.status_code < 400:
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+
+class CachedListMixin(ResourceVersionMixin):
+    """Кэширует данные ответа list с учётом версии ресурса.
+
+    Запись увеличивает версию, и старые ключи просто перестают
+    использоваться, пока не истечёт их время жизни.
+    """
+
+    def list(self, request, *args, **kwargs):
+        version, _ = self.get_resource_version()
+        cache = get_response_cache()
+        key = make_response_cache_key(request, self.version_name, version)
+        data = cache.get(key)
+        if data is not None:
+            count_response_cache(hit=True)
+            response = Response(data)
+            response['X-Cache'] = 'HIT'
+            return response
+        count_response_cache(hit=False)
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(
+                key,
+                response.data,
+                getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 300)
+            )
+        response['X-Cache'] = 'MISS'
+        return response
+
+
+class MetricsMixin:
+    """Замеряет время сериализации и рендеринга для QueryMetricsMiddleware.
+
+    `query_budget` задаёт допустимое число SQL-запросов для эндпоинтов
+    вьюсета, если оно не переопределено в settings.QUERY_BUDGETS.
+    """
+
+    query_budget = None
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        metrics = getattr(self.request, 'metrics', None)
+        if metrics is not None:
+            serializer.to_representation = self.timed(
+                serializer.to_representation, metrics
+            )
+        return serializer
+
+    @staticmethod
+    def timed(to_representation, metrics):
+        @wraps(to_representation)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return to_representation(*args, **kwargs)
+            finally:
+                metrics.serializer_ms += (
+                    time.perf_counter() - started
+                ) * 1000
+        return wrapper
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(
+            request, response, *args, **kwargs
+        )
+        metrics = getattr(request, 'metrics', None)
+        if metrics is not None and isinstance(response, Response):
+            started = time.perf_counter()
+
+            def count_render_time(rendered):
+                metrics.render_ms += (time.perf_counter() - started) * 1000
+
+            response.add_post_render_callback(count_render_time)
+        return response
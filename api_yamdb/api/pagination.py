@@ -0,0 +1,47 @@
+from rest_framework.pagination import (
+    BasePagination,
+    CursorPagination,
+    LimitOffsetPagination
+)
+
+
+class PubDateCursorPagination(CursorPagination):
+    """Постраничный вывод по ключу (pub_date, id) без подсчёта COUNT(*)."""
+
+    ordering = ('-pub_date', '-id')
+    page_size_query_param = 'limit'
+    max_page_size = 100
+
+
+class OptionalCursorPagination(BasePagination):
+    """LimitOffset по умолчанию, курсорная пагинация по параметру `cursor`.
+
+    Первая страница курсорного режима запрашивается с пустым `?cursor=`,
+    следующие — по ссылкам `next` и `previous` из ответа.
+    """
+
+    cursor_query_param = PubDateCursorPagination.cursor_query_param
+
+    def __init__(self):
+        self.paginator = None
+
+    def get_paginator(self, request):
+        if self.cursor_query_param in request.query_params:
+            return PubDateCursorPagination()
+        return LimitOffsetPagination()
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.paginator = self.get_paginator(request)
+        return self.paginator.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return LimitOffsetPagination().get_paginated_response_schema(schema)
+
+    def get_schema_operation_parameters(self, view):
+        return (
+            LimitOffsetPagination().get_schema_operation_parameters(view)
+            + PubDateCursorPagination().get_schema_operation_parameters(view)
+        )
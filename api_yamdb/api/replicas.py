@@ -0,0 +1,106 @@
+import itertools
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings
+
+STICKY_KEY_PREFIX = 'replica-sticky'
+
+state = threading.local()
+
+
+def get_replicas():
+    return tuple(getattr(settings, 'REPLICA_DATABASES', ()))
+
+
+class ReplicaChooser:
+    """Выбор реплики по кругу или с наименьшим числом запросов в работе.
+
+    Нагрузка считается в пределах процесса: каждый воркер видит только
+    свои запросы.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.in_flight = {}
+        self.replicas = ()
+        self.cycle = iter(())
+
+    def acquire(self):
+        replicas = get_replicas()
+        if not replicas:
+            return None
+        with self.lock:
+            if replicas != self.replicas:
+                self.replicas = replicas
+                self.cycle = itertools.cycle(replicas)
+                self.in_flight = dict.fromkeys(replicas, 0)
+            if getattr(settings, 'REPLICA_CHOICE', 'round_robin') == (
+                'least_loaded'
+            ):
+                alias = min(replicas, key=self.in_flight.__getitem__)
+            else:
+                alias = next(self.cycle)
+            self.in_flight[alias] += 1
+        return alias
+
+    def release(self, alias):
+        with self.lock:
+            if alias in self.in_flight:
+                self.in_flight[alias] -= 1
+
+
+chooser = ReplicaChooser()
+
+
+def get_token_user_id(request):
+    """id пользователя из JWT без обращения к базе или None."""
+    authentication = JWTAuthentication()
+    header = authentication.get_header(request)
+    raw_token = header and authentication.get_raw_token(header)
+    if not raw_token:
+        return None
+    try:
+        token = authentication.get_validated_token(raw_token)
+    except (InvalidToken, TokenError):
+        return None
+    return token.get(api_settings.USER_ID_CLAIM)
+
+
+def sticky_key(user_id):
+    return f'{STICKY_KEY_PREFIX}:{user_id}'
+
+
+def stick_to_primary(user_id):
+    """После записи читать данные пользователя с основной базы."""
+    window = getattr(settings, 'PRIMARY_STICKY_SECONDS', 5)
+    if window:
+        cache.set(sticky_key(user_id), True, window)
+
+
+def is_sticky(user_id):
+    return user_id is not None and bool(cache.get(sticky_key(user_id)))
+
+
+class ReplicaRouter:
+    """Чтения запроса, помеченного ReplicaMiddleware, идут на реплику,
+    все записи и чтения внутри транзакции — на основную базу."""
+
+    def db_for_read(self, model, **hints):
+        alias = getattr(state, 'alias', None)
+        if alias is None or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return None
+        return alias
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *get_replicas()}
+        if {obj1._state.db, obj2._state.db} <= databases:
+            return True
+        return None
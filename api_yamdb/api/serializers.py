@@ -1,9 +1,25 @@
 import datetime
 
+from django.db import transaction
 from rest_framework import serializers
-from django.db.models import Avg
+from rest_framework.settings import api_settings
 
-from reviews.models import Comment, Review, Title, User, Category, Genre
+from api.suggest import suggest_index
+from reviews.models import (
+    Comment, Review, Title, User, Category, Genre, GenreTitle
+)
+from reviews.search import index_titles
+from reviews.versions import NAMES, TITLES, bump_versions
+
+
+def check_year(value):
+    current_year = datetime.datetime.now().year
+    if value > current_year:
+        raise serializers.ValidationError(
+            'Год выпуска не может быть больше текущего',
+            f'Сейчас {current_year} год'
+        )
+    return value
 
 
 class GenreSerializer(serializers.ModelSerializer):
@@ -26,18 +42,34 @@ class ReadTitleSerializer(serializers.ModelSerializer):
         many=True
     )
     category = CategorySerializer(read_only=True)
-    rating = serializers.SerializerMethodField('count_rating')
 
-    def count_rating(self, value):
-        if value.score.count() > 0:
-            rating = value.score.aggregate(rt=Avg('score'))
-            return rating['rt']
-        return None
+    # Поля для `?fields=`, столбцы Title среди них и связи для `?expand=`
+    FIELDS = (
+        'id', 'name', 'year', 'description', 'genre', 'category',
+        'rating', 'weighted_rating'
+    )
+    COLUMNS = ('name', 'year', 'description', 'rating', 'weighted_rating')
+    EXPANDABLE = ('genre', 'category')
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        fields = self.context.get('fields')
+        if fields is None:
+            return
+        for name in set(self.fields) - fields:
+            self.fields.pop(name)
+        expand = self.context.get('expand', set())
+        if 'genre' in self.fields and 'genre' not in expand:
+            self.fields['genre'] = serializers.SlugRelatedField(
+                slug_field='slug', many=True, read_only=True
+            )
+        if 'category' in self.fields and 'category' not in expand:
+            self.fields['category'] = serializers.CharField(
+                source='category_slug', read_only=True
+            )
 
     class Meta:
-        fields = (
-            '__all__'
-        )
+        exclude = ('rating_sum', 'rating_count')
         model = Title
         read_only_fields = ('category', 'genre')
 
@@ -54,19 +86,154 @@ class TitleSerializer(serializers.ModelSerializer):
     )
 
     def validate_year(self, value):
-        current_year = datetime.datetime.now().year
-        if value > current_year:
-            raise serializers.ValidationError(
-                'Год выпуска не может быть больше текущего',
-                f'Сейчас {current_year} год'
-            )
-        return value
+        return check_year(value)
 
     class Meta:
         fields = ('id', 'name', 'year', 'description', 'genre', 'category',)
         model = Title
 
 
+class BulkTitleListSerializer(serializers.ListSerializer):
+    """Пакетная запись произведений.
+
+    Слаги жанров и категорий всех элементов разрешаются двумя запросами
+    IN, а произведения и связи с жанрами пишутся через bulk_create в одной
+    транзакции. Ошибки возвращаются списком по позициям элементов.
+    """
+
+    max_items = 5000
+
+    def to_internal_value(self, data):
+        if not isinstance(data, list) or not data:
+            return super().to_internal_value(data)
+        if len(data) > self.max_items:
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    f'Не больше {self.max_items} произведений за запрос.'
+                ]
+            }, code='max_length')
+        items = []
+        errors = []
+        for item in data:
+            try:
+                items.append(self.child.run_validation(item))
+                errors.append({})
+            except serializers.ValidationError as exc:
+                items.append({'genre': [], 'category': None})
+                errors.append(exc.detail)
+        self.resolve_slugs(items, errors)
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return items
+
+    def resolve_slugs(self, items, errors):
+        """Заменяет слаги ключами и дописывает ошибки по элементам."""
+        genres = dict(Genre.objects.filter(
+            slug__in={slug for item in items for slug in item['genre']}
+        ).values_list('slug', 'pk'))
+        categories = dict(Category.objects.filter(
+            slug__in={item['category'] for item in items}
+        ).values_list('slug', 'pk'))
+        ids = [item['id'] for item in items if 'id' in item]
+        existing = set(
+            Title.objects.filter(id__in=ids).values_list('id', flat=True)
+        ) if ids else set()
+        seen = set()
+        for item, item_errors in zip(items, errors):
+            if item_errors:
+                continue
+            missing = [slug for slug in item['genre'] if slug not in genres]
+            if missing:
+                item_errors['genre'] = [
+                    f'Жанр со slug={slug} не найден.' for slug in missing
+                ]
+            if item['category'] not in categories:
+                item_errors['category'] = [
+                    f'Категория со slug={item["category"]} не найдена.'
+                ]
+            if 'id' in item:
+                if item['id'] not in existing:
+                    item_errors['id'] = ['Произведение не найдено.']
+                elif item['id'] in seen:
+                    item_errors['id'] = ['Произведение указано дважды.']
+                seen.add(item['id'])
+            item['genre'] = list(dict.fromkeys(
+                genres.get(slug) for slug in item['genre']
+            ))
+            item['category'] = categories.get(item['category'])
+
+    def create(self, validated_data):
+        titles = [
+            Title(
+                id=item.get('id'),
+                name=item['name'],
+                year=item['year'],
+                description=item.get('description'),
+                category_id=item['category'],
+            )
+            for item in validated_data
+        ]
+        new = [title for title in titles if title.id is None]
+        old = [title for title in titles if title.id is not None]
+        with transaction.atomic():
+            Title.objects.bulk_update(
+                old, ('name', 'year', 'description', 'category')
+            )
+            Title.objects.bulk_create(new)
+            if new and new[0].pk is None:
+                # Без RETURNING ключи читаются обратно: запись держит
+                # блокировку БД до конца транзакции, поэтому последние
+                # len(new) ключей принадлежат только что вставленным строкам.
+                ids = Title.objects.order_by('-id').values_list(
+                    'id', flat=True
+                )[:len(new)]
+                for title, pk in zip(new, sorted(ids)):
+                    title.pk = pk
+            self.link_genres(titles, validated_data, old)
+            index_titles(titles)
+            bump_versions(TITLES, NAMES)
+        suggest_index.mark_stale()
+        return titles
+
+    def link_genres(self, titles, validated_data, old):
+        wanted = {
+            (title.pk, genre_id)
+            for title, item in zip(titles, validated_data)
+            for genre_id in item['genre']
+        }
+        current = {}
+        if old:
+            current = {
+                (title_id, genre_id): pk
+                for pk, title_id, genre_id in GenreTitle.objects.filter(
+                    title_id__in=[title.pk for title in old]
+                ).values_list('pk', 'title_id', 'genre_id')
+            }
+        stale = [pk for link, pk in current.items() if link not in wanted]
+        if stale:
+            GenreTitle.objects.filter(pk__in=stale).delete()
+        GenreTitle.objects.bulk_create(
+            GenreTitle(title_id=title_id, genre_id=genre_id)
+            for title_id, genre_id in wanted
+            if (title_id, genre_id) not in current
+        )
+
+
+class BulkTitleSerializer(serializers.Serializer):
+    id = serializers.IntegerField(required=False, min_value=1)
+    name = serializers.CharField(max_length=256)
+    year = serializers.IntegerField()
+    description = serializers.CharField(required=False, allow_null=True)
+    genre = serializers.ListField(child=serializers.SlugField())
+    category = serializers.SlugField()
+
+    def validate_year(self, value):
+        return check_year(value)
+
+    class Meta:
+        list_serializer_class = BulkTitleListSerializer
+
+
 class AuthSignUpSerializer(serializers.Serializer):
 
     email = serializers.EmailField(max_length=254)
@@ -107,6 +274,14 @@ class CommentSerializer(serializers.ModelSerializer):
         model = Comment
 
 
+class ReviewSummarySerializer(ReviewSerializer):
+    """Отзыв с числом комментариев и последним из них
+    (`?include=comments_summary`)."""
+
+    comments_count = serializers.IntegerField(read_only=True)
+    latest_comment = CommentSerializer(read_only=True)
+
+
 class UserSerializer(serializers.ModelSerializer):
 
     class Meta:
@@ -0,0 +1,29 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from api.authentication import user_cache
+from api.suggest import suggest_index
+from reviews.models import Category, Genre, Title, User
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    # После коммита: до него другие воркеры ещё читают из базы старую роль.
+    transaction.on_commit(lambda: user_cache.invalidate(instance.pk))
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_save, sender=Genre)
+@receiver(post_save, sender=Category)
+def refresh_suggest_index(sender, update_fields=None, **kwargs):
+    if update_fields is None or {'name', 'slug'} & set(update_fields):
+        suggest_index.mark_stale()
+
+
+@receiver(post_delete, sender=Title)
+@receiver(post_delete, sender=Genre)
+@receiver(post_delete, sender=Category)
+def refresh_suggest_index_on_delete(sender, **kwargs):
+    suggest_index.mark_stale()
@@ -0,0 +1,109 @@
+import bisect
+import re
+import threading
+import time
+
+from django.conf import settings
+
+from reviews.models import Category, Genre, Title
+from reviews.versions import NAMES, get_version
+
+WORD_START = re.compile(r'\w+')
+
+
+def normalize(text):
+    return text.casefold().replace('ё', 'е')
+
+
+class SuggestIndex:
+    """Отсортированные ключи названий для поиска по префиксу в памяти.
+
+    Для каждого названия хранится ключ с начала строки и ключи с начала
+    каждого следующего слова, так что «шоу» найдёт «Побег из Шоушенка».
+    Индекс перестраивается при первом запросе после записи в этом
+    процессе, а изменения из других процессов подхватываются не реже
+    раза в SUGGEST_CHECK_INTERVAL секунд по счётчику версии названий,
+    который не меняется от записи отзывов и оценок.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        with self.lock:
+            self.arrays = (([], []), ([], []))
+            self.version = None
+            self.checked = 0
+            self.stale = True
+
+    def mark_stale(self):
+        self.stale = True
+
+    def current_version(self):
+        return get_version(NAMES)[0]
+
+    def ensure_fresh(self):
+        interval = getattr(settings, 'SUGGEST_CHECK_INTERVAL', 30)
+        now = time.monotonic()
+        if not self.stale and now - self.checked < interval:
+            return
+        with self.lock:
+            version = self.current_version()
+            self.checked = now
+            if self.stale or version != self.version:
+                self.build(version)
+
+    def build(self, version):
+        heads = []
+        words = []
+        sources = (
+            ('category', Category.objects.values_list('name', 'slug')),
+            ('genre', Genre.objects.values_list('name', 'slug')),
+            ('title', Title.objects.values_list('name', 'id')),
+        )
+        for kind, rows in sources:
+            for name, key in rows.iterator():
+                item = (kind, name, key)
+                normalized = normalize(name)
+                heads.append((normalized, item))
+                for match in WORD_START.finditer(normalized):
+                    if match.start():
+                        words.append((normalized[match.start():], item))
+        self.arrays = tuple(
+            self.split(sorted(entries, key=lambda entry: entry[0]))
+            for entries in (heads, words)
+        )
+        self.version = version
+        self.stale = False
+
+    @staticmethod
+    def split(entries):
+        return (
+            [entry[0] for entry in entries],
+            [entry[1] for entry in entries],
+        )
+
+    def suggest(self, query, limit):
+        self.ensure_fresh()
+        prefix = normalize(query.strip())
+        if not prefix:
+            return []
+        found = []
+        seen = set()
+        # Совпадения с начала названия идут раньше совпадений внутри него.
+        for keys, items in self.arrays:
+            index = bisect.bisect_left(keys, prefix)
+            while index < len(keys) and keys[index].startswith(prefix):
+                item = items[index]
+                index += 1
+                if item in seen:
+                    continue
+                seen.add(item)
+                found.append(item)
+                if len(found) == limit:
+                    return found
+        return found
+
+
+suggest_index = SuggestIndex()
@@ -9,10 +9,13 @@ from .views import (
     CategoryViewSet,
     GenreViewSet,
     UserViewSet,
+    export_table,
     get_token,
+    metrics,
     signup_new_user,
     slug_cat_destroy,
     slug_gen_destroy,
+    suggest,
     user_me,
     username_update
 )
@@ -40,5 +43,8 @@ urlpatterns = [
     path('v1/categories/<slug:slug>/', slug_cat_destroy),
     path('v1/genres/<slug:slug>/', slug_gen_destroy),
     path('v1/users/', include(users_path)),
+    path('v1/export/<slug:table>.<slug:fmt>', export_table),
+    path('v1/_metrics/', metrics, name='metrics'),
+    path('v1/suggest/', suggest, name='suggest'),
     path('v1/', include(router_v1.urls))
 ]
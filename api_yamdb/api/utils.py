@@ -1,23 +1,24 @@
 import uuid
 
-from django.core.mail import send_mail
-from django.shortcuts import get_object_or_404
+from django.db import transaction
 
 from api_yamdb.settings import EMAIL_ADMIN
 
-from reviews.models import User
+from reviews.models import OutboxEmail
 
 
-def send_confirmation_code_to_email(username):
-    """Генерирует, отправляет на почту и сохраняет в базу код подтверждения."""
-    user = get_object_or_404(User, username=username)
-    confirmation_code = str(uuid.uuid3(uuid.NAMESPACE_DNS, username))
-    user.confirmation_code = confirmation_code
-    send_mail(
-        'Код подтвержения для  регистрации',
-        f'Ваш код для получения JWT токена {user.confirmation_code}',
-        EMAIL_ADMIN,
-        [user.email],
-        fail_silently=False,
-    )
-    user.save()
+def send_confirmation_code_to_email(user):
+    """Генерирует и сохраняет код подтверждения, ставит письмо в очередь.
+
+    Само письмо отправляет команда send_outbox, поэтому регистрация
+    не ждёт почтовый сервер.
+    """
+    user.confirmation_code = str(uuid.uuid3(uuid.NAMESPACE_DNS, user.username))
+    with transaction.atomic():
+        user.save(update_fields=('confirmation_code',))
+        OutboxEmail.objects.create(
+            subject='Код подтвержения для  регистрации',
+            body=f'Ваш код для получения JWT токена {user.confirmation_code}',
+            from_email=EMAIL_ADMIN,
+            to=user.email,
+        )
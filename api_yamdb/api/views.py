@@ -1,14 +1,29 @@
+from django.http import Http404, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django.db import IntegrityError
+from django.db.models import (
+    Count, F, IntegerField, OuterRef, Prefetch, Subquery
+)
+from django.db.models.functions import Coalesce
 
+from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, permissions, status, viewsets
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.pagination import LimitOffsetPagination
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import RefreshToken
 
-from reviews.models import Category, Comment, Genre, Review, Title, User
+from reviews.models import (
+    Category, Comment, Genre, Review, Title, TitleReviewStats, User
+)
+from reviews.versions import CATEGORIES, GENRES, TITLES
+from api.export import EXPORT_CONTENT_TYPES, EXPORT_STREAMS, EXPORT_TABLES
+from api.filters import NullsLastOrderingFilter, TitleFilter
+from api.cache import response_cache_stats
+from api.metrics import registry
+from api.mixins import CachedListMixin, ConditionalGetMixin, MetricsMixin
+from api.pagination import OptionalCursorPagination
 from api.permission import (
     AdminOrReadOnly,
     AdminOrStaffPermission,
@@ -17,14 +32,17 @@ from api.permission import (
 from api.serializers import (
     AuthSignUpSerializer,
     AuthTokenSerializer,
+    BulkTitleSerializer,
     CategorySerializer,
     CommentSerializer,
     GenreSerializer,
     ReadTitleSerializer,
     ReviewSerializer,
+    ReviewSummarySerializer,
     TitleSerializer,
     UserSerializer
 )
+from api.suggest import suggest_index
 from api.utils import send_confirmation_code_to_email
 
 
@@ -36,11 +54,11 @@ def signup_new_user(request):
     serializer = AuthSignUpSerializer(data=request.data)
     serializer.is_valid(raise_exception=True)
     try:
-        User.objects.get_or_create(
+        user, _ = User.objects.get_or_create(
             username=username,
             email=email
         )
-        send_confirmation_code_to_email(username)
+        send_confirmation_code_to_email(user)
         return Response(serializer.data, status=status.HTTP_200_OK)
     except IntegrityError:
         return Response(status=status.HTTP_400_BAD_REQUEST)
@@ -63,40 +81,118 @@ def get_token(request):
     )
 
 
-class TitleViewSet(viewsets.ModelViewSet):
-    queryset = Title.objects.all()
+class TitleViewSet(
+    MetricsMixin, ConditionalGetMixin, CachedListMixin, viewsets.ModelViewSet
+):
+    queryset = Title.objects.select_related('category').prefetch_related(
+        Prefetch('genre', queryset=Genre.objects.all())
+    )
     serializer_class = TitleSerializer
     permission_classes = (AdminOrReadOnly,)
+    filter_backends = (DjangoFilterBackend, NullsLastOrderingFilter)
+    filterset_class = TitleFilter
+    ordering_fields = ('rating', 'weighted_rating', 'name', 'year')
+    version_name = TITLES
+    top_default_limit = 10
+    top_max_limit = 100
 
     def get_serializer_class(self):
         if self.request.method in ('PATCH', 'POST',):
             return TitleSerializer
         return ReadTitleSerializer
 
+    def get_sparse_fields(self):
+        """Поля из `?fields=` (None — все) и связи из `?expand=`."""
+        if not hasattr(self, '_sparse_fields'):
+            params = self.request.query_params
+            fields = params.get('fields')
+            fields = set(fields.split(',')) - {''} if fields else None
+            expand = set(params.get('expand', '').split(',')) - {''}
+            unknown = (fields or set()) - set(ReadTitleSerializer.FIELDS)
+            unknown |= expand - set(ReadTitleSerializer.EXPANDABLE)
+            if unknown:
+                raise ValidationError({
+                    'fields': f'Неизвестные поля: {", ".join(sorted(unknown))}'
+                })
+            self._sparse_fields = fields, expand
+        return self._sparse_fields
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.request.method == 'GET':
+            context['fields'], context['expand'] = self.get_sparse_fields()
+        return context
+
     def get_queryset(self):
-        queryset = Title.objects.all()
-        genre = self.request.query_params.get('genre')
-        year = self.request.query_params.get('year')
-        name = self.request.query_params.get('name')
-        category = self.request.query_params.get('category')
-        if genre is not None:
-            related = Genre.objects.get(slug=genre)
-            queryset = Title.objects.filter(genre=related.id)
-        if year is not None:
-            queryset = Title.objects.filter(year=year)
-        if name is not None:
-            queryset = Title.objects.filter(name__icontains=name)
-        if category is not None:
-            queryset = Title.objects.filter(category__slug=category)
+        if self.request.method != 'GET':
+            return super().get_queryset()
+        fields, expand = self.get_sparse_fields()
+        if fields is None:
+            return super().get_queryset()
+        # Читаются только нужные столбцы, а связи без expand отдаются
+        # слагами: категория — через JOIN в том же запросе, жанры — одним
+        # prefetch только слагов.
+        columns = fields & set(ReadTitleSerializer.COLUMNS)
+        if 'category' in fields and 'category' in expand:
+            columns.add('category')
+        queryset = Title.objects.only('id', *columns)
+        if 'category' in columns:
+            queryset = queryset.select_related('category')
+        elif 'category' in fields:
+            queryset = queryset.annotate(category_slug=F('category__slug'))
+        if 'genre' in fields:
+            queryset = queryset.prefetch_related(Prefetch(
+                'genre',
+                queryset=(
+                    Genre.objects.all() if 'genre' in expand
+                    else Genre.objects.only('slug')
+                )
+            ))
         return queryset
 
+    @action(detail=False)
+    def top(self, request):
+        """Произведения с наибольшим рейтингом."""
+        return self.conditional_response(self.top_titles, request)
 
-class GenreViewSet(viewsets.ModelViewSet):
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """Пакетное создание и обновление произведений."""
+        serializer = BulkTitleSerializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        titles = serializer.save()
+        queryset = self.get_queryset().filter(
+            id__in=[title.id for title in titles]
+        ).order_by('id')
+        return Response(
+            ReadTitleSerializer(queryset, many=True).data,
+            status=status.HTTP_201_CREATED
+        )
+
+    def top_titles(self, request):
+        try:
+            limit = int(request.query_params.get(
+                'limit', self.top_default_limit
+            ))
+        except ValueError:
+            limit = self.top_default_limit
+        limit = max(1, min(limit, self.top_max_limit))
+        queryset = self.filter_queryset(self.get_queryset()).filter(
+            rating__isnull=False
+        ).order_by('-rating', 'id')[:limit]
+        serializer = self.get_serializer(queryset, many=True)
+        return Response(serializer.data)
+
+
+class GenreViewSet(
+    MetricsMixin, ConditionalGetMixin, CachedListMixin, viewsets.ModelViewSet
+):
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
     filter_backends = (filters.SearchFilter,)
     search_fields = ('name',)
     permission_classes = (AdminOrReadOnly,)
+    version_name = GENRES
 
 
 @api_view(['DELETE'])
@@ -110,12 +206,15 @@ def slug_gen_destroy(request, slug):
     return Response(status=status.HTTP_403_FORBIDDEN)
 
 
-class CategoryViewSet(viewsets.ModelViewSet):
+class CategoryViewSet(
+    MetricsMixin, ConditionalGetMixin, CachedListMixin, viewsets.ModelViewSet
+):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     filter_backends = (filters.SearchFilter,)
     search_fields = ('name',)
     permission_classes = (AdminOrReadOnly,)
+    version_name = CATEGORIES
 
 
 @api_view(['DELETE'])
@@ -129,41 +228,141 @@ def slug_cat_destroy(request, slug):
     return Response(status=status.HTTP_403_FORBIDDEN)
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+def score_at(histogram, position):
+    """Балл отзыва с номером position в порядке возрастания оценок."""
+    seen = 0
+    for score, number in histogram.items():
+        seen += number
+        if seen > position:
+            return score
+
+
+def score_summary(histogram):
+    """Сводка оценок по гистограмме {балл: число отзывов}."""
+    count = sum(histogram.values())
+    if not count:
+        return {
+            'count': 0, 'mean': None, 'median': None, 'histogram': histogram
+        }
+    return {
+        'count': count,
+        'mean': sum(
+            score * number for score, number in histogram.items()
+        ) / count,
+        'median': (
+            score_at(histogram, (count - 1) // 2)
+            + score_at(histogram, count // 2)
+        ) / 2,
+        'histogram': histogram,
+    }
+
+
+def attach_latest_comments(reviews):
+    """Проставляет отзывам latest_comment одним запросом.
+
+    Id последнего комментария каждого отзыва уже выбран подзапросом
+    `latest_comment_id` по индексу (review_id, pub_date, id); здесь
+    комментарии с авторами читаются по этим id.
+    """
+    reviews = list(reviews)
+    comments = Comment.objects.select_related('author').in_bulk(
+        {review.latest_comment_id for review in reviews} - {None}
+    )
+    for review in reviews:
+        review.latest_comment = comments.get(review.latest_comment_id)
+
+
+class ReviewViewSet(MetricsMixin, viewsets.ModelViewSet):
     queryset = Review.objects.all()
     serializer_class = ReviewSerializer
     permission_classes = [
         permissions.IsAuthenticatedOrReadOnly,
         AuthorOrModerPermission]
-    pagination_class = LimitOffsetPagination
+    pagination_class = OptionalCursorPagination
+
+    def get_includes(self):
+        return set(filter(
+            None, self.request.query_params.get('include', '').split(',')
+        ))
+
+    def get_title(self):
+        """Произведение из URL, читаемое раз за запрос."""
+        if not hasattr(self, '_title'):
+            self._title = get_object_or_404(Title, id=self.kwargs['title_id'])
+        return self._title
 
     def get_queryset(self):
-        title_id = self.kwargs['title_id']
-        title = Title.objects.get(id=title_id)
-        return title.score.all()
+        queryset = self.get_title().score.select_related('author')
+        if 'comments_summary' in self.get_includes():
+            queryset = self.with_comments_summary(queryset)
+        return queryset
 
-    def create(self, request, title_id):
-        queryset = Review.objects.filter(
-            author=self.request.user,
-            title=title_id
+    @staticmethod
+    def with_comments_summary(queryset):
+        """Число комментариев и id последнего из них подзапросами; сам
+        последний комментарий get_serializer читает одним запросом на
+        страницу отзывов."""
+        comments = Comment.objects.filter(review_id=OuterRef('pk'))
+        return queryset.annotate(
+            comments_count=Coalesce(Subquery(
+                comments.order_by()
+                .values('review_id')
+                .annotate(number=Count('id'))
+                .values('number'),
+                output_field=IntegerField()
+            ), 0),
+            latest_comment_id=Subquery(
+                comments.order_by('-pub_date', '-id').values('id')[:1]
+            )
+        )
+
+    def get_serializer_class(self):
+        if (
+            self.request.method == 'GET'
+            and 'comments_summary' in self.get_includes()
+        ):
+            return ReviewSummarySerializer
+        return ReviewSerializer
+
+    def get_serializer(self, *args, **kwargs):
+        if args and self.get_serializer_class() is ReviewSummarySerializer:
+            reviews = args[0] if kwargs.get('many') else [args[0]]
+            attach_latest_comments(reviews)
+        return super().get_serializer(*args, **kwargs)
+
+    @action(detail=False)
+    def stats(self, request, title_id):
+        """Количество, среднее, медиана и гистограмма оценок произведения."""
+        title = get_object_or_404(
+            Title.objects.select_related('review_stats'), id=title_id
         )
-        if queryset.exists():
-            return Response(status=status.HTTP_400_BAD_REQUEST)
+        try:
+            histogram = title.review_stats.histogram
+        except TitleReviewStats.DoesNotExist:
+            histogram = dict.fromkeys(TitleReviewStats.SCORES, 0)
+        return Response(score_summary(histogram))
+
+    def create(self, request, title_id):
+        title = self.get_title()
         serializer = ReviewSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        serializer.save(
-            author=self.request.user,
-            title=get_object_or_404(Title, id=self.kwargs['title_id'])
-        )
+        # Повторный отзыв отсекает ограничение unique_author_title.
+        try:
+            serializer.save(author=self.request.user, title=title)
+        except IntegrityError:
+            return Response(
+                {'detail': 'Вы уже оставили отзыв на это произведение.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(MetricsMixin, viewsets.ModelViewSet):
     queryset = Comment.objects.all()
     serializer_class = CommentSerializer
     permission_classes = [
         AuthorOrModerPermission, permissions.IsAuthenticatedOrReadOnly]
-    pagination_class = LimitOffsetPagination
+    pagination_class = OptionalCursorPagination
 
     def get_queryset(self):
         review_id = self.kwargs['review_id']
@@ -181,7 +380,8 @@ class CommentViewSet(viewsets.ModelViewSet):
 @permission_classes([IsAuthenticated])
 def user_me(request):
     """Редактирование личного профиля."""
-    user = request.user
+    # request.user может быть собран из кэша аутентификации без части полей.
+    user = get_object_or_404(User, pk=request.user.pk)
     if request.method == 'PATCH':
         serializer = UserSerializer(user, data=request.data, partial=True)
         if not user.is_admin:
@@ -195,7 +395,7 @@ def user_me(request):
     return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(MetricsMixin, viewsets.ModelViewSet):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     http_method_names = ['get', 'post']
@@ -223,3 +423,51 @@ def username_update(request, slug):
             serializer = UserSerializer(user)
             return Response(serializer.data, status=status.HTTP_200_OK)
     return Response(status=status.HTTP_403_FORBIDDEN)
+
+
+@api_view(['GET'])
+@permission_classes([AdminOrStaffPermission])
+def export_table(request, table, fmt):
+    """Потоковая выгрузка таблицы в CSV или NDJSON."""
+    if table not in EXPORT_TABLES or fmt not in EXPORT_STREAMS:
+        raise Http404
+    response = StreamingHttpResponse(
+        EXPORT_STREAMS[fmt](table),
+        content_type=EXPORT_CONTENT_TYPES[fmt]
+    )
+    response['Content-Disposition'] = (
+        f'attachment; filename="{table}.{fmt}"'
+    )
+    return response
+
+
+@api_view(['GET'])
+@permission_classes([AdminOrStaffPermission])
+def metrics(request):
+    """Гистограммы SQL-запросов и времени ответа по эндпоинтам."""
+    return Response({
+        'endpoints': registry.snapshot(),
+        'response_cache': response_cache_stats(),
+    })
+
+
+SUGGEST_DEFAULT_LIMIT = 10
+SUGGEST_MAX_LIMIT = 50
+SUGGEST_KEYS = {'title': 'id', 'genre': 'slug', 'category': 'slug'}
+
+
+@api_view(['GET'])
+def suggest(request):
+    """Подсказки по префиксу среди названий жанров, категорий и
+    произведений из индекса в памяти процесса."""
+    query = request.query_params.get('q', '')
+    try:
+        limit = int(request.query_params.get('limit', SUGGEST_DEFAULT_LIMIT))
+    except ValueError:
+        limit = SUGGEST_DEFAULT_LIMIT
+    limit = max(1, min(limit, SUGGEST_MAX_LIMIT))
+    results = [
+        {'type': kind, 'name': name, SUGGEST_KEYS[kind]: key}
+        for kind, name, key in suggest_index.suggest(query, limit)
+    ]
+    return Response({'results': results})
@@ -3,14 +3,19 @@ ASGI config for YaMDb project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
-For more information on this file, see
-https://docs.djangoproject.com/en/3.0/howto/deployment/asgi/
+Django 2.2 has no ASGI handler of its own, so requests are served by the
+regular WSGI handler in a bounded thread pool (see asgi_bridge.py).
 """
 
 import os
 
-from django.core.asgi import get_asgi_application
+from django.conf import settings
+from django.core.wsgi import get_wsgi_application
+
+from api_yamdb.asgi_bridge import ThreadedASGIHandler
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
 
-application = get_asgi_application()
+application = ThreadedASGIHandler(
+    get_wsgi_application(), max_workers=settings.ASGI_THREADS
+)
@@ -0,0 +1,198 @@
+import asyncio
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from io import BytesIO
+
+RESPONSE_QUEUE_SIZE = 8
+# Как часто поток, ждущий места в очереди, проверяет, не прерван ли ответ
+PUT_POLL_SECONDS = 1
+
+
+class ResponseAborted(Exception):
+    """Ответ больше некому отдавать: relay остановлен или цикл закрыт."""
+
+
+class ThreadedASGIHandler:
+    """ASGI-приложение поверх синхронного WSGIHandler.
+
+    Django 2.2 не умеет асинхронные вьюхи, поэтому каждый запрос целиком
+    (вьюха, запросы к базе, закрытие соединений в request_finished)
+    выполняется в одном потоке из пула ограниченного размера, а цикл
+    событий только принимает тело запроса и отдаёт ответ. Размер пула
+    ограничивает и число одновременных соединений с базой. Потоковые
+    ответы передаются по частям через очередь с ограниченным размером,
+    так что медленный клиент притормаживает поток, а не копит ответ в
+    памяти.
+    """
+
+    def __init__(self, wsgi_application, max_workers):
+        self.wsgi_application = wsgi_application
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix='asgi'
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            return await self.lifespan(receive, send)
+        if scope['type'] != 'http':
+            raise ValueError(f'Неподдерживаемый тип ASGI: {scope["type"]}')
+        body = await self.read_body(receive)
+        if body is None:
+            return
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(RESPONSE_QUEUE_SIZE)
+        cancelled = threading.Event()
+
+        def put(item):
+            # Без проверки флага поток навсегда застрял бы на полной
+            # очереди, которую никто не читает, и пул потерял бы слот.
+            if cancelled.is_set():
+                raise ResponseAborted
+            future = asyncio.run_coroutine_threadsafe(queue.put(item), loop)
+            while True:
+                try:
+                    return future.result(PUT_POLL_SECONDS)
+                except TimeoutError:
+                    if cancelled.is_set() or loop.is_closed():
+                        future.cancel()
+                        raise ResponseAborted
+
+        worker = loop.run_in_executor(
+            self.executor,
+            self.run_wsgi,
+            self.build_environ(scope, body),
+            put
+        )
+        await self.relay(queue, send, cancelled)
+        await worker
+
+    @staticmethod
+    async def read_body(receive):
+        """Тело запроса целиком или None, если клиент отключился."""
+        chunks = []
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                return None
+            chunks.append(message.get('body', b''))
+            if not message.get('more_body', False):
+                return b''.join(chunks)
+
+    @staticmethod
+    async def relay(queue, send, cancelled):
+        """Пересылает клиенту заголовки и части ответа из потока.
+
+        Если send упал или задачу отменили при отключении клиента, поток
+        узнаёт об этом по флагу cancelled, а очередь освобождается, чтобы
+        ждущий в ней put() завершился.
+        """
+        try:
+            started = False
+            while True:
+                kind, payload = await queue.get()
+                if kind == 'end':
+                    break
+                if kind == 'start':
+                    started = True
+                    await send({
+                        'type': 'http.response.start',
+                        'status': payload[0],
+                        'headers': payload[1],
+                    })
+                else:
+                    await send({
+                        'type': 'http.response.body',
+                        'body': payload,
+                        'more_body': True,
+                    })
+            if not started:
+                await send({
+                    'type': 'http.response.start',
+                    'status': 500,
+                    'headers': [(b'content-type', b'text/plain')],
+                })
+            await send({'type': 'http.response.body', 'body': b''})
+        finally:
+            cancelled.set()
+            while not queue.empty():
+                queue.get_nowait()
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                # Ждать потоки вне цикла: отдающие ответ потоки ждут его в
+                # put(), и блокирующий shutdown здесь никогда бы не вернулся.
+                await asyncio.get_running_loop().run_in_executor(
+                    None, self.executor.shutdown
+                )
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    def run_wsgi(self, environ, put):
+        def start_response(status, headers, exc_info=None):
+            try:
+                put(('start', (
+                    int(status.split(' ', 1)[0]),
+                    [
+                        (name.lower().encode('latin-1'),
+                         value.encode('latin-1'))
+                        for name, value in headers
+                    ],
+                )))
+            except ResponseAborted:
+                # Исключение отсюда не дало бы Django вернуть ответ и
+                # закрыть его (request_finished, соединения с базой);
+                # обрыв заметит цикл по телу ответа.
+                pass
+
+        try:
+            try:
+                result = self.wsgi_application(environ, start_response)
+                try:
+                    for chunk in result:
+                        if chunk:
+                            put(('body', chunk))
+                finally:
+                    close = getattr(result, 'close', None)
+                    if close is not None:
+                        close()
+            finally:
+                put(('end', None))
+        except ResponseAborted:
+            pass
+
+    @staticmethod
+    def build_environ(scope, body):
+        server = scope.get('server') or ('localhost', 80)
+        client = scope.get('client') or ('', 0)
+        environ = {
+            'REQUEST_METHOD': scope['method'],
+            'SCRIPT_NAME': scope.get('root_path', ''),
+            'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+            'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+            'SERVER_NAME': server[0],
+            'SERVER_PORT': str(server[1]),
+            'SERVER_PROTOCOL': f'HTTP/{scope.get("http_version", "1.1")}',
+            'REMOTE_ADDR': client[0],
+            'CONTENT_LENGTH': str(len(body)),
+            'wsgi.version': (1, 0),
+            'wsgi.url_scheme': scope.get('scheme', 'http'),
+            'wsgi.input': BytesIO(body),
+            'wsgi.errors': sys.stderr,
+            'wsgi.multithread': True,
+            'wsgi.multiprocess': True,
+            'wsgi.run_once': False,
+        }
+        for name, value in scope.get('headers', ()):
+            name = name.decode('latin-1').upper().replace('-', '_')
+            value = value.decode('latin-1')
+            if name not in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+                name = f'HTTP_{name}'
+            if name in environ and name != 'CONTENT_LENGTH':
+                value = f'{environ[name]},{value}'
+            environ[name] = value
+        return environ
@@ -0,0 +1,63 @@
+import os
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+CACHE_BACKENDS = {
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+    'dummy': 'django.core.cache.backends.dummy.DummyCache',
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+    'db': 'django.core.cache.backends.db.DatabaseCache',
+    'memcached': 'django.core.cache.backends.memcached.MemcachedCache',
+    'pylibmc': 'django.core.cache.backends.memcached.PyLibMCCache',
+}
+
+# У каждого процесса свой экземпляр такого кэша (у dummy — пустой).
+LOCAL_CACHE_BACKENDS = (CACHE_BACKENDS['locmem'], CACHE_BACKENDS['dummy'])
+
+TRUE_VALUES = ('1', 'true', 'yes', 'on')
+
+
+def env_bool(name, default=False):
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in TRUE_VALUES
+
+
+def env_int(name, default):
+    value = os.environ.get(name)
+    return default if value in (None, '') else int(value)
+
+
+def env_list(name, default):
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+def parse_cache_url(url):
+    """Словарь для CACHES из URL вида `memcached://host:11211`.
+
+    Для file и db путь URL — каталог или имя таблицы кэша.
+    """
+    parts = urlsplit(url)
+    if parts.scheme not in CACHE_BACKENDS:
+        raise ValueError(f'Неизвестная схема CACHE_URL: {parts.scheme}')
+    config = {'BACKEND': CACHE_BACKENDS[parts.scheme]}
+    if parts.scheme in ('memcached', 'pylibmc'):
+        config['LOCATION'] = parts.netloc.split(',')
+    elif parts.scheme == 'file':
+        config['LOCATION'] = unquote(parts.path)
+    elif parts.scheme in ('db', 'locmem') and (parts.netloc or parts.path):
+        config['LOCATION'] = unquote(parts.netloc + parts.path).strip('/')
+    options = dict(parse_qsl(parts.query))
+    if 'timeout' in options:
+        config['TIMEOUT'] = int(options.pop('timeout'))
+    if options:
+        config['OPTIONS'] = options
+    return config
+
+
+def is_shared_cache(config):
+    """Видят ли все процессы одни и те же записи кэша из CACHES."""
+    return config['BACKEND'] not in LOCAL_CACHE_BACKENDS
@@ -0,0 +1,29 @@
+from django.conf import settings
+
+# PRAGMA по профилям. В режиме WAL читатели не блокируют писателя, а
+# busy_timeout заставляет конкурирующую запись ждать вместо немедленной
+# ошибки "database is locked".
+SQLITE_PROFILES = {
+    'default': {},
+    'performance': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'mmap_size': 256 * 1024 * 1024,
+        'cache_size': -64 * 1024,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 5000,
+    },
+}
+
+
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    """Выставляет PRAGMA из settings.SQLITE_PRAGMAS новому соединению.
+
+    Подключается к connection_created в ApiConfig.ready().
+    """
+    pragmas = getattr(settings, 'SQLITE_PRAGMAS', None)
+    if connection.vendor != 'sqlite' or not pragmas:
+        return
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
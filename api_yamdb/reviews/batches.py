@@ -0,0 +1,23 @@
+from django.db import transaction
+
+
+def transaction_batch(name, factory):
+    """Накопитель `name` текущей транзакции или None вне транзакции.
+
+    Накопитель создаётся вызовом `factory()` и регистрируется в on_commit,
+    поэтому после коммита он вызывается один раз. Если транзакцию или
+    точку сохранения, где он создан, откатили, Django выбрасывает его
+    колбэк, и следующий вызов начинает новый накопитель.
+    """
+    connection = transaction.get_connection()
+    if not connection.in_atomic_block:
+        return None
+    attribute = f'{name}_batch'
+    batch = getattr(connection, attribute, None)
+    if batch is None or not any(
+        callback is batch for _, callback in connection.run_on_commit
+    ):
+        batch = factory()
+        setattr(connection, attribute, batch)
+        transaction.on_commit(batch)
+    return batch
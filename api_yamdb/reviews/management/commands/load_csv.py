@@ -0,0 +1,240 @@
+import csv
+import os
+import time
+from contextlib import contextmanager
+from itertools import islice
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import IntegrityError, connection, transaction
+from django.utils.dateparse import parse_datetime
+
+from reviews.management.commands.rebuild_search_index import (
+    rebuild_title_search_index
+)
+from reviews.management.commands.recount_ratings import recount_ratings
+from reviews.management.commands.recount_weighted_ratings import (
+    recount_weighted_ratings
+)
+from reviews.models import (
+    BaseTypeCategory, Category, Comment, Genre, GenreTitle, Review, Title,
+    User
+)
+from reviews.versions import CATEGORIES, GENRES, NAMES, bump_versions
+
+DEFAULT_DATA_DIR = os.path.join(settings.BASE_DIR, 'static', 'data')
+
+
+@contextmanager
+def keep_csv_pub_date(*models):
+    """Не даёт auto_now_add перезаписать pub_date из файла."""
+    fields = [model._meta.get_field('pub_date') for model in models]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+class Command(BaseCommand):
+    help = 'Загружает CSV-файлы из static/data в пустую базу данных.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            default=DEFAULT_DATA_DIR,
+            help='Каталог с CSV-файлами.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help=(
+                'Сколько строк CSV читается и вставляется за один шаг; '
+                'размер отдельного INSERT выбирает бэкенд БД.'
+            )
+        )
+
+    def handle(self, *args, **options):
+        self.path = options['path']
+        self.batch_size = options['batch_size']
+        if self.batch_size < 1:
+            raise CommandError('--batch-size должен быть больше нуля')
+        # id из файла -> id в базе для всех таблиц, на которые есть ссылки.
+        self.ids = {
+            model: {} for model in (User, Category, Genre, Title, Review)
+        }
+        try:
+            self.load_all()
+        except IntegrityError as error:
+            raise CommandError(
+                f'Данные уже загружены или конфликтуют: {error}'
+            )
+
+    def load_all(self):
+        with transaction.atomic(), keep_csv_pub_date(Review, Comment):
+            self.load('users.csv', User, self.build_user)
+            self.load_base_type('category.csv', Category)
+            self.load_base_type('genre.csv', Genre)
+            self.load('titles.csv', Title, self.build_title)
+            self.load('genre_title.csv', GenreTitle, self.build_genre_title)
+            self.load('review.csv', Review, self.build_review)
+            self.load('comments.csv', Comment, self.build_comment)
+            self.reset_sequences(
+                (User, BaseTypeCategory, Title, GenreTitle, Review, Comment)
+            )
+            bump_versions(GENRES, CATEGORIES, NAMES)
+            recount_ratings()
+            recount_weighted_ratings(settings.WEIGHTED_RATING_MIN_VOTES)
+            rebuild_title_search_index()
+
+    def read_batches(self, filename):
+        with open(
+            os.path.join(self.path, filename), encoding='utf-8', newline=''
+        ) as csv_file:
+            reader = csv.DictReader(csv_file)
+            rows = ((row, reader.line_num) for row in reader)
+            while True:
+                batch = list(islice(rows, self.batch_size))
+                if not batch:
+                    return
+                yield batch
+
+    def report(self, filename, total, started):
+        elapsed = time.monotonic() - started
+        speed = total / elapsed if elapsed else total
+        self.stdout.write(self.style.SUCCESS(
+            f'{filename}: {total} строк за {elapsed:.2f} с '
+            f'({speed:.0f} строк/с)'
+        ))
+
+    def load(self, filename, model, build):
+        started = time.monotonic()
+        total = 0
+        for batch in self.read_batches(filename):
+            objects = [build(row, line_num) for row, line_num in batch]
+            # Размер одного INSERT внутри пачки выбирает бэкенд: у SQLite
+            # есть ограничения на число параметров и UNION ALL в запросе.
+            model.objects.bulk_create(objects)
+            if model in self.ids:
+                self.ids[model].update(
+                    (int(row['id']), obj.id)
+                    for (row, _), obj in zip(batch, objects)
+                )
+            total += len(objects)
+        self.report(filename, total, started)
+
+    def load_base_type(self, filename, model):
+        """Загружает категории или жанры.
+
+        Категории и жанры наследуются от BaseTypeCategory и делят с ней
+        общую последовательность id, поэтому id из файла не сохраняются:
+        сначала пачкой создаются родительские строки, затем по slug
+        выбираются их id и вставляются дочерние строки.
+        """
+        started = time.monotonic()
+        total = 0
+        child_table = connection.ops.quote_name(model._meta.db_table)
+        ptr_column = connection.ops.quote_name(model._meta.pk.column)
+        for batch in self.read_batches(filename):
+            BaseTypeCategory.objects.bulk_create(
+                [
+                    BaseTypeCategory(name=row['name'], slug=row['slug'])
+                    for row, _ in batch
+                ]
+            )
+            db_ids = dict(
+                BaseTypeCategory.objects.filter(
+                    slug__in=[row['slug'] for row, _ in batch]
+                ).values_list('slug', 'id')
+            )
+            with connection.cursor() as cursor:
+                cursor.executemany(
+                    f'INSERT INTO {child_table} ({ptr_column}) VALUES (%s)',
+                    [(db_ids[row['slug']],) for row, _ in batch]
+                )
+            self.ids[model].update(
+                (int(row['id']), db_ids[row['slug']]) for row, _ in batch
+            )
+            total += len(batch)
+        self.report(filename, total, started)
+
+    def reset_sequences(self, models):
+        sql_list = connection.ops.sequence_reset_sql(no_style(), models)
+        with connection.cursor() as cursor:
+            for sql in sql_list:
+                cursor.execute(sql)
+
+    def related_id(self, model, value, filename, line_num):
+        try:
+            return self.ids[model][int(value)]
+        except KeyError:
+            raise CommandError(
+                f'{filename}, строка {line_num}: нет объекта '
+                f'{model.__name__} с id={value}'
+            )
+
+    def build_user(self, row, line_num):
+        return User(
+            id=int(row['id']),
+            username=row['username'],
+            email=row['email'],
+            role=row['role'],
+            bio=row['bio'],
+            first_name=row['first_name'],
+            last_name=row['last_name'],
+            password=make_password(None),
+        )
+
+    def build_title(self, row, line_num):
+        return Title(
+            id=int(row['id']),
+            name=row['name'],
+            year=int(row['year']),
+            description=row.get('description') or None,
+            category_id=self.related_id(
+                Category, row['category'], 'titles.csv', line_num
+            ) if row['category'] else None,
+        )
+
+    def build_genre_title(self, row, line_num):
+        return GenreTitle(
+            id=int(row['id']),
+            title_id=self.related_id(
+                Title, row['title_id'], 'genre_title.csv', line_num
+            ),
+            genre_id=self.related_id(
+                Genre, row['genre_id'], 'genre_title.csv', line_num
+            ),
+        )
+
+    def build_review(self, row, line_num):
+        return Review(
+            id=int(row['id']),
+            title_id=self.related_id(
+                Title, row['title_id'], 'review.csv', line_num
+            ),
+            author_id=self.related_id(
+                User, row['author'], 'review.csv', line_num
+            ),
+            text=row['text'],
+            score=int(row['score']),
+            pub_date=parse_datetime(row['pub_date']),
+        )
+
+    def build_comment(self, row, line_num):
+        return Comment(
+            id=int(row['id']),
+            review_id_id=self.related_id(
+                Review, row['review_id'], 'comments.csv', line_num
+            ),
+            author_id=self.related_id(
+                User, row['author'], 'comments.csv', line_num
+            ),
+            text=row['text'],
+            pub_date=parse_datetime(row['pub_date']),
+        )
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from reviews.models import Title
+from reviews.search import rebuild_index
+
+
+def rebuild_title_search_index():
+    rebuild_index(
+        Title.objects.values_list('id', 'name', 'description').iterator()
+    )
+
+
+class Command(BaseCommand):
+    help = 'Перестраивает полнотекстовый индекс произведений.'
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            self.stdout.write(
+                'Индекс поддерживает сама база данных, перестраивать нечего'
+            )
+            return
+        with transaction.atomic():
+            rebuild_title_search_index()
+        self.stdout.write(self.style.SUCCESS('Поисковый индекс перестроен'))
@@ -0,0 +1,59 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import (
+    Avg, Count, FloatField, IntegerField, OuterRef, Subquery, Sum
+)
+from django.db.models.functions import Coalesce
+
+from reviews.models import Review, Title, TitleReviewStats
+from reviews.versions import TITLES, bump_versions
+
+
+def rating_subquery(aggregate, output_field):
+    return Subquery(
+        Review.objects.filter(title=OuterRef('pk'))
+        .order_by()
+        .values('title')
+        .annotate(value=aggregate)
+        .values('value'),
+        output_field=output_field
+    )
+
+
+def recount_review_stats():
+    """Заново собирает гистограммы оценок по отзывам."""
+    stats = {}
+    for title_id, score, number in (
+        Review.objects.order_by().values_list('title_id', 'score')
+        .annotate(number=Count('id'))
+    ):
+        stats.setdefault(title_id, TitleReviewStats(title_id=title_id))
+        setattr(stats[title_id], TitleReviewStats.score_field(score), number)
+    TitleReviewStats.objects.all().delete()
+    TitleReviewStats.objects.bulk_create(stats.values())
+
+
+def recount_ratings():
+    """Пересчитывает рейтинги всех произведений одним запросом."""
+    bump_versions(TITLES)
+    recount_review_stats()
+    return Title.objects.update(
+        rating_sum=Coalesce(
+            rating_subquery(Sum('score'), IntegerField()), 0
+        ),
+        rating_count=Coalesce(
+            rating_subquery(Count('id'), IntegerField()), 0
+        ),
+        rating=rating_subquery(Avg('score'), FloatField())
+    )
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает сохранённые рейтинги произведений по отзывам.'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            updated = recount_ratings()
+        self.stdout.write(
+            self.style.SUCCESS(f'Пересчитан рейтинг {updated} произведений')
+        )
@@ -0,0 +1,62 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import F, FloatField, Sum
+from django.db.models.functions import Cast
+
+from reviews.models import Title
+from reviews.versions import TITLES, bump_versions
+
+
+def recount_weighted_ratings(min_votes):
+    """Пересчитывает взвешенный рейтинг всех произведений.
+
+    WR = (v / (v + m)) * R + (m / (v + m)) * C, где v — число оценок,
+    R — средняя оценка произведения, m — минимальное число оценок,
+    C — средняя оценка по всем отзывам. C берётся из сохранённых сумм
+    одним агрегатом, сам рейтинг считается одним UPDATE.
+    """
+    totals = Title.objects.aggregate(
+        score_sum=Sum('rating_sum'), score_count=Sum('rating_count')
+    )
+    if not totals['score_count']:
+        Title.objects.update(weighted_rating=None)
+        bump_versions(TITLES)
+        return None
+    mean = totals['score_sum'] / totals['score_count']
+    votes = Cast(F('rating_count'), FloatField())
+    Title.objects.filter(rating_count=0).update(weighted_rating=None)
+    Title.objects.filter(rating_count__gt=0).update(
+        weighted_rating=(
+            votes * F('rating') + min_votes * mean
+        ) / (votes + min_votes)
+    )
+    bump_versions(TITLES)
+    return mean
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает взвешенный рейтинг произведений. '
+        'Запускается по расписанию.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--min-votes',
+            type=int,
+            default=getattr(settings, 'WEIGHTED_RATING_MIN_VOTES', 25),
+            help='Минимальное число оценок m в формуле взвешенного рейтинга.'
+        )
+
+    def handle(self, *args, **options):
+        if options['min_votes'] < 0:
+            raise CommandError('--min-votes не может быть отрицательным')
+        with transaction.atomic():
+            mean = recount_weighted_ratings(options['min_votes'])
+        if mean is None:
+            self.stdout.write('Отзывов нет, взвешенный рейтинг сброшен')
+            return
+        self.stdout.write(self.style.SUCCESS(
+            f'Взвешенный рейтинг пересчитан, средняя оценка C = {mean:.3f}'
+        ))
@@ -0,0 +1,142 @@
+import time
+import uuid
+from datetime import timedelta
+
+from django.core.mail import EmailMessage, get_connection
+from django.core.management.base import BaseCommand
+from django.db.models import F, Q
+from django.utils import timezone
+
+from reviews.models import OutboxEmail
+
+
+class Command(BaseCommand):
+    help = (
+        'Отправляет письма из очереди пачками через одно SMTP-соединение. '
+        'С --interval работает как постоянный обработчик.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=100,
+            help='Количество писем, отправляемых за одно соединение.'
+        )
+        parser.add_argument(
+            '--max-attempts',
+            type=int,
+            default=5,
+            help='После стольких неудачных попыток письмо больше не шлётся.'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=0,
+            help='Пауза между проверками очереди в секундах; 0 — один проход.'
+        )
+        parser.add_argument(
+            '--lease',
+            type=float,
+            default=300,
+            help=(
+                'На сколько секунд письма захватываются обработчиком; '
+                'после падения они вернутся в очередь по истечении срока.'
+            )
+        )
+
+    def handle(self, *args, **options):
+        lease = timedelta(seconds=options['lease'])
+        while True:
+            sent, failed = self.drain(
+                options['batch_size'], options['max_attempts'], lease
+            )
+            if sent or failed:
+                self.stdout.write(
+                    f'Отправлено писем: {sent}, ошибок: {failed}'
+                )
+            if not options['interval']:
+                return
+            time.sleep(options['interval'])
+
+    def drain(self, batch_size, max_attempts, lease):
+        sent = failed = 0
+        last_id = 0
+        while True:
+            claimed = self.claim(batch_size, max_attempts, lease, last_id)
+            if claimed is None:
+                return sent, failed
+            last_id, batch = claimed
+            if batch:
+                batch_sent, batch_failed = self.send_batch(batch)
+                sent += batch_sent
+                failed += batch_failed
+
+    def claim(self, batch_size, max_attempts, lease, last_id):
+        """Захватывает пачку писем, чтобы их не отправил другой обработчик.
+
+        Возвращает последний просмотренный id и захваченные письма или
+        None, если после last_id свободных писем нет.
+        """
+        now = timezone.now()
+        pending = OutboxEmail.objects.filter(
+            Q(locked_until__isnull=True) | Q(locked_until__lt=now),
+            sent_at__isnull=True,
+            attempts__lt=max_attempts
+        )
+        ids = list(
+            pending.filter(id__gt=last_id)
+            .values_list('id', flat=True)[:batch_size]
+        )
+        if not ids:
+            return None
+        claim = uuid.uuid4()
+        # UPDATE заново проверяет условия, поэтому из двух обработчиков,
+        # выбравших одни и те же письма, строку получит только один.
+        pending.filter(id__in=ids).update(
+            claim=claim, locked_until=now + lease
+        )
+        return ids[-1], list(
+            OutboxEmail.objects.filter(claim=claim, id__in=ids)
+        )
+
+    def send_batch(self, batch):
+        connection = get_connection(fail_silently=False)
+        try:
+            connection.open()
+        except Exception as error:
+            self.mark_failed(batch, error)
+            return 0, len(batch)
+        sent = 0
+        try:
+            for email in batch:
+                message = EmailMessage(
+                    email.subject,
+                    email.body,
+                    email.from_email,
+                    [email.to],
+                    connection=connection
+                )
+                try:
+                    connection.send_messages([message])
+                except Exception as error:
+                    self.mark_failed([email], error)
+                else:
+                    # Отметка сразу после отправки: при падении посреди
+                    # пачки уже доставленные письма не уйдут повторно.
+                    OutboxEmail.objects.filter(id=email.id).update(
+                        sent_at=timezone.now(), locked_until=None
+                    )
+                    sent += 1
+        finally:
+            connection.close()
+        return sent, len(batch) - sent
+
+    def mark_failed(self, emails, error):
+        OutboxEmail.objects.filter(
+            id__in=[email.id for email in emails]
+        ).update(
+            attempts=F('attempts') + 1,
+            last_error=str(error),
+            locked_until=None
+        )
@@ -0,0 +1,56 @@
+# Generated by Django 2.2.16 on 2026-10-18 03:00
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def fill_ratings(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    Review = apps.get_model('reviews', 'Review')
+
+    def scores(aggregate, output_field):
+        return models.Subquery(
+            Review.objects.filter(title=models.OuterRef('pk'))
+            .order_by()
+            .values('title')
+            .annotate(value=aggregate)
+            .values('value'),
+            output_field=output_field
+        )
+
+    # Один UPDATE вместо чтения и сохранения каждого произведения.
+    Title.objects.update(
+        rating_sum=Coalesce(
+            scores(models.Sum('score'), models.IntegerField()), 0
+        ),
+        rating_count=Coalesce(
+            scores(models.Count('id'), models.IntegerField()), 0
+        ),
+        rating=scores(models.Avg('score'), models.FloatField())
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='rating',
+            field=models.FloatField(blank=True, null=True, verbose_name='Рейтинг'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Количество оценок'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0, verbose_name='Сумма оценок'),
+        ),
+        migrations.RunPython(fill_ratings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,49 @@
+from django.db import migrations
+
+from reviews.search import FTS_TABLE, PG_SEARCH_VECTOR, stem_text
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(
+            f'CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5('
+            "name, description, tokenize = 'unicode61 remove_diacritics 2')"
+        )
+        Title = apps.get_model('reviews', 'Title')
+        rows = [
+            (title_id, stem_text(name), stem_text(description))
+            for title_id, name, description in Title.objects.values_list(
+                'id', 'name', 'description'
+            ).iterator()
+        ]
+        with schema_editor.connection.cursor() as cursor:
+            cursor.executemany(
+                f'INSERT INTO {FTS_TABLE} (rowid, name, description) '
+                'VALUES (%s, %s, %s)',
+                rows
+            )
+    elif vendor == 'postgresql':
+        schema_editor.execute(
+            'CREATE INDEX title_search_idx ON reviews_title '
+            f'USING GIN (({PG_SEARCH_VECTOR}))'
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+    elif vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS title_search_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0008_title_weighted_rating'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
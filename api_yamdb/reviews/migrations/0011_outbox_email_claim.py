@@ -0,0 +1,23 @@
+# Generated by Django 2.2.16 on 2026-10-18 03:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0010_title_review_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='outboxemail',
+            name='claim',
+            field=models.UUIDField(blank=True, null=True, verbose_name='Захвачено обработчиком'),
+        ),
+        migrations.AddField(
+            model_name='outboxemail',
+            name='locked_until',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Захвачено до'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+from django.db import migrations
+
+# На PostgreSQL индекс `rating DESC` хранит NULL в начале, и сортировка
+# `rating DESC NULLS LAST` не может по нему пройти. SQLite и так держит
+# NULL с краю наименьших значений, поэтому там индексы не меняются.
+RATING_INDEXES = (
+    ('title_rating_idx', 'rating DESC{}, id'),
+    ('title_weighted_rating_idx', 'weighted_rating DESC{}, id'),
+    ('title_category_rating_idx', 'category_id, rating DESC{}'),
+)
+
+
+def recreate_indexes(schema_editor, nulls):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, columns in RATING_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+        schema_editor.execute(
+            f'CREATE INDEX {name} ON reviews_title ({columns.format(nulls)})'
+        )
+
+
+def nulls_last(apps, schema_editor):
+    recreate_indexes(schema_editor, ' NULLS LAST')
+
+
+def nulls_first(apps, schema_editor):
+    recreate_indexes(schema_editor, '')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0011_outbox_email_claim'),
+    ]
+
+    operations = [
+        migrations.RunPython(nulls_last, nulls_first),
+    ]
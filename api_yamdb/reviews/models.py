@@ -1,7 +1,7 @@
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import models, transaction
 
 
 class BaseTypeCategory(models.Model):
@@ -48,6 +48,24 @@ class Title(models.Model):
         on_delete=models.SET_NULL,
         null=True
     )
+    rating_sum = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Сумма оценок'
+    )
+    rating_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Количество оценок'
+    )
+    rating = models.FloatField(
+        null=True,
+        blank=True,
+        verbose_name='Рейтинг'
+    )
+    weighted_rating = models.FloatField(
+        null=True,
+        blank=True,
+        verbose_name='Взвешенный рейтинг'
+    )
 
     def __str__(self) -> str:
         return self.name
@@ -56,6 +74,22 @@ class Title(models.Model):
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произвдения'
         ordering = ('name',)
+        indexes = (
+            models.Index(fields=('name',), name='title_name_idx'),
+            models.Index(fields=('year',), name='title_year_idx'),
+            models.Index(
+                fields=('category', 'year'), name='title_category_year_idx'
+            ),
+            models.Index(fields=('-rating', 'id'), name='title_rating_idx'),
+            models.Index(
+                fields=('-weighted_rating', 'id'),
+                name='title_weighted_rating_idx'
+            ),
+            models.Index(
+                fields=('category', '-rating'),
+                name='title_category_rating_idx'
+            ),
+        )
 
 
 class GenreTitle(models.Model):
@@ -180,8 +214,126 @@ class Review(BaseComment):
                 name='unique_author_title'
             ),
         )
+        indexes = (
+            models.Index(
+                fields=('title', 'pub_date', 'id'),
+                name='review_title_pub_date_idx'
+            ),
+        )
+
+    def save(self, *args, **kwargs):
+        # Рейтинг произведения обновляется сигналами в той же транзакции.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+
+class TitleReviewStats(models.Model):
+    """Число оценок каждого балла по произведению.
+
+    Обновляется сигналами отзывов в той же транзакции, что и сам отзыв.
+    """
+
+    SCORES = range(1, 11)
+
+    title = models.OneToOneField(
+        Title,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='review_stats'
+    )
+    score_1 = models.PositiveIntegerField(default=0)
+    score_2 = models.PositiveIntegerField(default=0)
+    score_3 = models.PositiveIntegerField(default=0)
+    score_4 = models.PositiveIntegerField(default=0)
+    score_5 = models.PositiveIntegerField(default=0)
+    score_6 = models.PositiveIntegerField(default=0)
+    score_7 = models.PositiveIntegerField(default=0)
+    score_8 = models.PositiveIntegerField(default=0)
+    score_9 = models.PositiveIntegerField(default=0)
+    score_10 = models.PositiveIntegerField(default=0)
+
+    def __str__(self) -> str:
+        return f'Оценки {self.title_id}'
+
+    @staticmethod
+    def score_field(score):
+        return f'score_{score}'
+
+    @property
+    def histogram(self):
+        return {
+            score: getattr(self, self.score_field(score))
+            for score in self.SCORES
+        }
+
+    class Meta:
+        verbose_name = 'Статистика оценок'
+        verbose_name_plural = 'Статистика оценок'
 
 
 class Comment(BaseComment):
     review_id = models.ForeignKey(
         Review, on_delete=models.CASCADE, related_name='comments')
+
+    class Meta:
+        indexes = (
+            models.Index(
+                fields=('review_id', 'pub_date', 'id'),
+                name='comment_review_pub_date_idx'
+            ),
+        )
+
+
+class OutboxEmail(models.Model):
+    """Письмо, ожидающее отправки командой send_outbox."""
+
+    subject = models.CharField(max_length=256, verbose_name='Тема')
+    body = models.TextField(verbose_name='Текст')
+    from_email = models.EmailField(max_length=254, verbose_name='Отправитель')
+    to = models.EmailField(max_length=254, verbose_name='Получатель')
+    created = models.DateTimeField('Дата создания', auto_now_add=True)
+    sent_at = models.DateTimeField('Дата отправки', null=True, blank=True)
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name='Попыток отправки'
+    )
+    last_error = models.TextField(blank=True, verbose_name='Последняя ошибка')
+    claim = models.UUIDField(
+        null=True,
+        blank=True,
+        verbose_name='Захвачено обработчиком'
+    )
+    locked_until = models.DateTimeField(
+        'Захвачено до',
+        null=True,
+        blank=True
+    )
+
+    def __str__(self) -> str:
+        return f'{self.subject} -> {self.to}'
+
+    class Meta:
+        verbose_name = 'Исходящее письмо'
+        verbose_name_plural = 'Исходящие письма'
+        ordering = ('id',)
+        indexes = (
+            models.Index(
+                fields=('sent_at', 'attempts', 'id'),
+                name='outbox_pending_idx'
+            ),
+        )
+
+
+class ResourceVersion(models.Model):
+    """Счётчик изменений ресурса API для ETag и кэширования ответов."""
+
+    name = models.CharField(max_length=32, primary_key=True)
+    version = models.PositiveIntegerField(default=0)
+    modified = models.DateTimeField('Дата изменения', auto_now=True)
+
+    def __str__(self) -> str:
+        return f'{self.name}: {self.version}'
+
+    class Meta:
+        verbose_name = 'Версия ресурса'
+        verbose_name_plural = 'Версии ресурсов'
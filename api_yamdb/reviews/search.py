@@ -0,0 +1,229 @@
+"""Полнотекстовый поиск произведений по названию и описанию.
+
+На SQLite используется виртуальная таблица FTS5, в которую сигналы
+записывают основы слов (русский стеммер Snowball), на PostgreSQL —
+GIN-индекс по to_tsvector('russian', ...). На прочих бэкендах поиск
+сводится к icontains.
+"""
+import re
+
+from django.db import connection
+from django.db.models import Q
+
+FTS_TABLE = 'reviews_title_fts'
+PG_SEARCH_VECTOR = (
+    "to_tsvector('russian', coalesce(reviews_title.name, '') || ' ' || "
+    "coalesce(reviews_title.description, ''))"
+)
+
+VOWELS = 'аеиоуыэюя'
+PERFECTIVE_GERUND = (
+    ('в', 'вши', 'вшись'),
+    ('ив', 'ивши', 'ившись', 'ыв', 'ывши', 'ывшись'),
+)
+ADJECTIVE = (
+    (),
+    (
+        'ее', 'ие', 'ые', 'ое', 'ими', 'ыми', 'ей', 'ий', 'ый', 'ой', 'ем',
+        'им', 'ым', 'ом', 'его', 'ого', 'ему', 'ому', 'их', 'ых', 'ую', 'юю',
+        'ая', 'яя', 'ою', 'ею',
+    ),
+)
+PARTICIPLE = (
+    ('ем', 'нн', 'вш', 'ющ', 'щ'),
+    ('ивш', 'ывш', 'ующ'),
+)
+REFLEXIVE = ((), ('ся', 'сь'))
+VERB = (
+    (
+        'ла', 'на', 'ете', 'йте', 'ли', 'й', 'л', 'ем', 'н', 'ло', 'но', 'ет',
+        'ют', 'ны', 'ть', 'ешь', 'нно',
+    ),
+    (
+        'ила', 'ыла', 'ена', 'ейте', 'уйте', 'ите', 'или', 'ыли', 'ей', 'уй',
+        'ил', 'ыл', 'им', 'ым', 'ен', 'ило', 'ыло', 'ено', 'ят', 'ует', 'уют',
+        'ит', 'ыт', 'ены', 'ить', 'ыть', 'ишь', 'ую', 'ю',
+    ),
+)
+NOUN = (
+    (),
+    (
+        'а', 'ев', 'ов', 'ие', 'ье', 'е', 'иями', 'ями', 'ами', 'еи', 'ии',
+        'и', 'ией', 'ей', 'ой', 'ий', 'й', 'иям', 'ям', 'ием', 'ем', 'ам',
+        'ом', 'о', 'у', 'ах', 'иях', 'ях', 'ы', 'ь', 'ию', 'ью', 'ю', 'ия',
+        'ья', 'я',
+    ),
+)
+DERIVATIONAL = ((), ('ост', 'ость'))
+SUPERLATIVE = ((), ('ейш', 'ейше'))
+
+
+def _regions(word):
+    rv = r1 = r2 = len(word)
+    for index, char in enumerate(word):
+        if char in VOWELS:
+            rv = index + 1
+            break
+    for index in range(1, len(word)):
+        if word[index] not in VOWELS and word[index - 1] in VOWELS:
+            r1 = index + 1
+            break
+    for index in range(r1 + 1, len(word)):
+        if word[index] not in VOWELS and word[index - 1] in VOWELS:
+            r2 = index + 1
+            break
+    return rv, r1, r2
+
+
+def _strip(word, start, groups):
+    """Удаляет самое длинное окончание из groups, лежащее в word[start:].
+
+    Окончания первой группы удаляются, только если перед ними в той же
+    области стоит «а» или «я».
+    """
+    candidates = sorted(
+        (
+            (suffix, after_a)
+            for after_a, suffixes in zip((True, False), groups)
+            for suffix in suffixes
+        ),
+        key=lambda candidate: len(candidate[0]),
+        reverse=True
+    )
+    for suffix, after_a in candidates:
+        cut = len(word) - len(suffix)
+        if cut < start or not word.endswith(suffix):
+            continue
+        if after_a and (cut - 1 < start or word[cut - 1] not in 'ая'):
+            continue
+        return word[:cut]
+    return None
+
+
+def stem(word):
+    """Основа русского слова по алгоритму Snowball."""
+    word = word.lower().replace('ё', 'е')
+    rv, _, r2 = _regions(word)
+    stripped = _strip(word, rv, PERFECTIVE_GERUND)
+    if stripped is None:
+        word = _strip(word, rv, REFLEXIVE) or word
+        stripped = _strip(word, rv, ADJECTIVE)
+        if stripped is not None:
+            stripped = _strip(stripped, rv, PARTICIPLE) or stripped
+        else:
+            stripped = _strip(word, rv, VERB) or _strip(word, rv, NOUN)
+    word = stripped if stripped is not None else word
+    if word.endswith('и') and len(word) - 1 >= rv:
+        word = word[:-1]
+    word = _strip(word, r2, DERIVATIONAL) or word
+    if word.endswith('нн') and len(word) - 2 >= rv:
+        return word[:-1]
+    stripped = _strip(word, rv, SUPERLATIVE)
+    if stripped is not None:
+        word = stripped
+        if word.endswith('нн') and len(word) - 2 >= rv:
+            word = word[:-1]
+        return word
+    if word.endswith('ь') and len(word) - 1 >= rv:
+        return word[:-1]
+    return word
+
+
+def tokenize(text):
+    return re.findall(r'\w+', (text or '').lower())
+
+
+def stem_text(text):
+    return ' '.join(stem(token) for token in tokenize(text))
+
+
+def index_title(title):
+    index_titles([title])
+
+
+def index_titles(titles):
+    """Обновляет записи индекса для пачки произведений."""
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f'DELETE FROM {FTS_TABLE} WHERE rowid = %s',
+            [(title.pk,) for title in titles]
+        )
+        cursor.executemany(
+            f'INSERT INTO {FTS_TABLE} (rowid, name, description) '
+            'VALUES (%s, %s, %s)',
+            [
+                (title.pk, stem_text(title.name),
+                 stem_text(title.description))
+                for title in titles
+            ]
+        )
+
+
+def remove_title(title_id):
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [title_id])
+
+
+def prune_index():
+    """Удаляет из индекса строки произведений, удалённых мимо сигналов."""
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {FTS_TABLE} WHERE rowid NOT IN '
+            '(SELECT id FROM reviews_title)'
+        )
+
+
+def rebuild_index(titles):
+    """Заново заполняет индекс по итератору кортежей (id, name, описание)."""
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE}')
+        cursor.executemany(
+            f'INSERT INTO {FTS_TABLE} (rowid, name, description) '
+            'VALUES (%s, %s, %s)',
+            (
+                (title_id, stem_text(name), stem_text(description))
+                for title_id, name, description in titles
+            )
+        )
+
+
+def search_titles(queryset, query):
+    """Фильтрует произведения по запросу и сортирует по релевантности."""
+    tokens = tokenize(query)
+    if not tokens:
+        return queryset
+    if connection.vendor == 'sqlite':
+        match = ' '.join(f'"{stem(token)}"*' for token in tokens)
+        return queryset.extra(
+            tables=[FTS_TABLE],
+            where=[
+                f'{FTS_TABLE}.rowid = reviews_title.id',
+                f'{FTS_TABLE} MATCH %s',
+            ],
+            params=[match],
+            select={'search_rank': f'bm25({FTS_TABLE}, 10.0, 1.0)'},
+            order_by=['search_rank'],
+        )
+    if connection.vendor == 'postgresql':
+        return queryset.extra(
+            where=[f"{PG_SEARCH_VECTOR} @@ plainto_tsquery('russian', %s)"],
+            params=[query],
+            select={
+                'search_rank': f"ts_rank({PG_SEARCH_VECTOR}, "
+                               f"plainto_tsquery('russian', %s))",
+            },
+            select_params=[query],
+            order_by=['-search_rank'],
+        )
+    condition = Q()
+    for token in tokens:
+        condition &= Q(name__icontains=token) | Q(description__icontains=token)
+    return queryset.filter(condition)
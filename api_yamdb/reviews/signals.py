@@ -0,0 +1,214 @@
+from collections import Counter, defaultdict
+
+from django.db.models import Case, F, FloatField, When
+from django.db.models.functions import Cast
+from django.db.models.signals import (
+    m2m_changed, post_delete, post_migrate, post_save, pre_delete, pre_save
+)
+from django.dispatch import receiver
+
+from reviews.batches import transaction_batch
+from reviews.models import (
+    Category, Genre, GenreTitle, Review, Title, TitleReviewStats
+)
+from reviews.search import index_title, prune_index, remove_title
+from reviews.versions import (
+    CATEGORIES, GENRES, NAMES, TITLES, bump_versions
+)
+
+
+def change_title_rating(title_id, score_delta, count_delta):
+    """Атомарно сдвигает сумму и количество оценок произведения."""
+    new_sum = F('rating_sum') + score_delta
+    new_count = F('rating_count') + count_delta
+    Title.objects.filter(id=title_id).update(
+        rating_sum=new_sum,
+        rating_count=new_count,
+        rating=Case(
+            When(rating_count=-count_delta, then=None),
+            default=Cast(new_sum, FloatField()) / new_count,
+            output_field=FloatField()
+        )
+    )
+
+
+def change_score_counts(title_id, deltas):
+    """Сдвигает счётчики баллов в гистограмме оценок произведения.
+
+    `deltas` — словарь {балл: изменение}; всё меняется одним UPDATE.
+    """
+    fields = {
+        TitleReviewStats.score_field(score): delta
+        for score, delta in deltas.items()
+    }
+    changes = {field: F(field) + delta for field, delta in fields.items()}
+    stats = TitleReviewStats.objects.filter(title_id=title_id)
+    if stats.update(**changes) or min(fields.values()) < 0:
+        return
+    _, created = TitleReviewStats.objects.get_or_create(
+        title_id=title_id, defaults=fields
+    )
+    if not created:
+        stats.update(**changes)
+
+
+class DeletedReviews:
+    """Отзывы и произведения, удаляемые в текущей транзакции.
+
+    Collector.delete шлёт pre_delete для всех объектов до удаления строк,
+    а post_delete — после, поэтому к первому post_delete отзыва известны
+    все удаляемые отзывы и произведения.
+    """
+
+    def __init__(self):
+        self.titles = set()
+        self.scores = []
+
+    def __call__(self):
+        # Рейтинги пересчитаны ещё в post_delete, до коммита.
+        pass
+
+    def pop_changes(self):
+        """Забирает изменения оценок, сгруппированные по произведениям.
+
+        Отзывы удаляемых произведений пропускаются: их рейтинг и
+        гистограмма удаляются вместе с ними.
+        """
+        changes = defaultdict(Counter)
+        for title_id, score in self.scores:
+            if title_id not in self.titles:
+                changes[title_id][score] -= 1
+        self.scores.clear()
+        return changes.items()
+
+
+def deleted_reviews():
+    return transaction_batch('deleted_reviews', DeletedReviews)
+
+
+@receiver(pre_save, sender=Review)
+def remember_previous_score(sender, instance, **kwargs):
+    instance._previous_rating = None
+    if instance.pk is not None:
+        # Review.save идёт в транзакции: блокировка строки не даёт двум
+        # параллельным правкам вычесть из рейтинга одну и ту же оценку.
+        instance._previous_rating = (
+            Review.objects.select_for_update()
+            .filter(pk=instance.pk)
+            .values_list('title_id', 'score')
+            .first()
+        )
+
+
+@receiver(post_save, sender=Review)
+def update_rating_on_save(sender, instance, created, **kwargs):
+    previous = getattr(instance, '_previous_rating', None)
+    if created or previous is None:
+        change_title_rating(instance.title_id, instance.score, 1)
+        change_score_counts(instance.title_id, {instance.score: 1})
+        return
+    previous_title_id, previous_score = previous
+    if previous_title_id != instance.title_id:
+        change_title_rating(previous_title_id, -previous_score, -1)
+        change_title_rating(instance.title_id, instance.score, 1)
+    elif previous_score != instance.score:
+        change_title_rating(
+            instance.title_id, instance.score - previous_score, 0
+        )
+    else:
+        return
+    change_score_counts(previous_title_id, {previous_score: -1})
+    change_score_counts(instance.title_id, {instance.score: 1})
+
+
+@receiver(pre_delete, sender=Title)
+def remember_deleted_title(sender, instance, **kwargs):
+    batch = deleted_reviews()
+    if batch is not None:
+        batch.titles.add(instance.pk)
+
+
+@receiver(pre_delete, sender=Review)
+def remember_deleted_review(sender, instance, **kwargs):
+    batch = deleted_reviews()
+    if batch is not None:
+        batch.scores.append((instance.title_id, instance.score))
+
+
+@receiver(post_delete, sender=Review)
+def update_rating_on_delete(sender, instance, **kwargs):
+    batch = deleted_reviews()
+    if batch is None:
+        changes = [(instance.title_id, {instance.score: -1})]
+    else:
+        changes = batch.pop_changes()
+    for title_id, scores in changes:
+        change_title_rating(
+            title_id,
+            sum(score * delta for score, delta in scores.items()),
+            sum(scores.values())
+        )
+        change_score_counts(title_id, scores)
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_delete, sender=Title)
+@receiver(post_save, sender=GenreTitle)
+@receiver(post_delete, sender=GenreTitle)
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def bump_titles_version(sender, **kwargs):
+    bump_versions(TITLES)
+
+
+@receiver(m2m_changed, sender=GenreTitle)
+def bump_titles_version_on_genres(sender, action, **kwargs):
+    if action.startswith('post_'):
+        bump_versions(TITLES)
+
+
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+def bump_genres_version(sender, **kwargs):
+    # Жанры вложены в ответы произведений.
+    bump_versions(GENRES, TITLES)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def bump_categories_version(sender, **kwargs):
+    # Категории вложены в ответы произведений.
+    bump_versions(CATEGORIES, TITLES)
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_save, sender=Genre)
+@receiver(post_save, sender=Category)
+def bump_names_version(sender, update_fields=None, **kwargs):
+    # Подсказкам важны только названия и слаги, а не рейтинг или год.
+    if update_fields is None or {'name', 'slug'} & set(update_fields):
+        bump_versions(NAMES)
+
+
+@receiver(post_delete, sender=Title)
+@receiver(post_delete, sender=Genre)
+@receiver(post_delete, sender=Category)
+def bump_names_version_on_delete(sender, **kwargs):
+    bump_versions(NAMES)
+
+
+@receiver(post_save, sender=Title)
+def update_search_index(sender, instance, **kwargs):
+    index_title(instance)
+
+
+@receiver(post_delete, sender=Title)
+def remove_from_search_index(sender, instance, **kwargs):
+    remove_title(instance.pk)
+
+
+@receiver(post_migrate)
+def prune_search_index(sender, app_config=None, **kwargs):
+    # flush удаляет произведения без сигналов, не трогая таблицу FTS.
+    if app_config is not None and app_config.label == 'reviews':
+        prune_index()
@@ -0,0 +1,120 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from reviews.models import ResourceVersion
+
+TITLES = 'titles'
+GENRES = 'genres'
+CATEGORIES = 'categories'
+# Названия и слаги произведений, жанров и категорий — для подсказок.
+NAMES = 'names'
+
+VERSION_CACHE_PREFIX = 'resource-version'
+
+
+def version_cache():
+    # Версии лежат в том же кэше, что и ответы, которые по ним кэшируются.
+    return caches[getattr(settings, 'RESPONSE_CACHE_ALIAS', 'default')]
+
+
+def version_cache_key(name, alias=DEFAULT_DB_ALIAS):
+    # Реплика может отставать, поэтому её версия кэшируется отдельно от
+    # версии основной базы: иначе устаревшие данные с реплики попали бы в
+    # кэш ответов под новой версией.
+    return f'{VERSION_CACHE_PREFIX}:{alias}:{name}'
+
+
+def version_cache_timeout():
+    return getattr(settings, 'RESOURCE_VERSION_CACHE_TIMEOUT', 5)
+
+
+def version_cache_shared():
+    # В локальном кэше процесса версия не узнала бы о записи в другом
+    # воркере, и тот отдавал бы устаревшие списки и 304.
+    return getattr(settings, 'CACHE_SHARED', False)
+
+
+class BumpedVersions(dict):
+    """Увеличенные версии ресурсов: {имя: (версия, время изменения)}.
+
+    Регистрируется в on_commit и после коммита кладёт версии в кэш, если
+    он общий.
+    """
+
+    def __call__(self):
+        if not version_cache_shared():
+            return
+        version_cache().set_many(
+            {version_cache_key(name): row for name, row in self.items()},
+            version_cache_timeout()
+        )
+
+
+def bumped_names(connection):
+    # Колбэки откаченных точек сохранения Django уже выбросил, поэтому
+    # здесь только увеличения, которые войдут в коммит.
+    return {
+        name
+        for _, callback in connection.run_on_commit
+        if isinstance(callback, BumpedVersions)
+        for name in callback
+    }
+
+
+def increment_versions(names):
+    now = timezone.now()
+    versions = ResourceVersion.objects.filter(name__in=names)
+    updated = versions.update(version=F('version') + 1, modified=now)
+    if updated < len(names):
+        for name in names:
+            ResourceVersion.objects.get_or_create(
+                name=name, defaults={'version': 1, 'modified': now}
+            )
+    bumped = BumpedVersions.fromkeys(names)
+    if version_cache_shared():
+        bumped.update(
+            (name, (version, modified))
+            for name, version, modified in versions.values_list(
+                'name', 'version', 'modified'
+            )
+        )
+    return bumped
+
+
+def bump_versions(*names):
+    """Увеличивает счётчики изменений ресурсов.
+
+    В транзакции каждый счётчик увеличивается один раз, сколько бы строк
+    ни поменялось: до коммита новую версию всё равно никто не видит.
+    Новые значения записываются в общий кэш после коммита, чтобы чтение
+    версии в запросах на чтение не стоило отдельного обращения к базе.
+    """
+    names = set(names)
+    connection = transaction.get_connection()
+    if connection.in_atomic_block:
+        names -= bumped_names(connection)
+    if names:
+        transaction.on_commit(increment_versions(names))
+
+
+def get_version(name):
+    """Возвращает пару (версия, время изменения) ресурса.
+
+    Из общего кэша значение берётся без запроса, а при промахе читается
+    из базы. Без общего кэша версия всегда читается из базы: это один
+    запрос по первичному ключу.
+    """
+    versions = ResourceVersion.objects.filter(name=name)
+    if not version_cache_shared():
+        return versions.values_list('version', 'modified').first() or (0, None)
+    cache = version_cache()
+    key = version_cache_key(name, versions.db)
+    row = cache.get(key)
+    if row is None:
+        row = versions.values_list('version', 'modified').first() or (0, None)
+        # add, а не set: не затирать более свежее значение после коммита.
+        cache.add(key, row, version_cache_timeout())
+    return row
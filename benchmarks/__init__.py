@@ -0,0 +1,9 @@
+"""Нагрузочные замеры API YaMDb.
+
+Запуск из корня репозитория::
+
+    python -m benchmarks.run --titles 2000 --requests 5000 --output bench.json
+
+Данные создаются во временной тестовой базе, запросы выполняются
+в том же процессе через URLconf проекта.
+"""
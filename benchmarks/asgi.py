@@ -0,0 +1,212 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT_DIR, 'api_yamdb'))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Сравнение чтения через ASGI и WSGI при высокой '
+                    'конкурентности в одном процессе.'
+    )
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument(
+        '--threads', type=int, default=16,
+        help='Размер пула потоков ASGI-приложения.'
+    )
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--titles', type=int, default=500)
+    parser.add_argument('--users', type=int, default=100)
+    parser.add_argument('--reviews-per-title', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument(
+        '--no-response-cache',
+        action='store_true',
+        help='Отключить кэш ответов, чтобы мерить путь до базы.'
+    )
+    parser.add_argument('--output', help='Файл для JSON-отчёта.')
+    return parser.parse_args(argv)
+
+
+def read_paths(count, seed):
+    """Пути горячих эндпоинтов чтения: произведения, отзывы, комментарии."""
+    from reviews.models import Review, Title
+
+    rng = random.Random(seed)
+    title_ids = list(Title.objects.values_list('id', flat=True))
+    reviews = list(Review.objects.values_list('id', 'title_id'))
+    paths = []
+    for _ in range(count):
+        review_id, title_id = rng.choice(reviews)
+        paths.append(rng.choice((
+            f'/api/v1/titles/?limit=10&offset={rng.randrange(0, 50, 10)}',
+            f'/api/v1/titles/{rng.choice(title_ids)}/',
+            f'/api/v1/titles/{title_id}/reviews/',
+            f'/api/v1/titles/{title_id}/reviews/{review_id}/comments/',
+        )))
+    return paths
+
+
+def summary(latencies, elapsed, errors):
+    from benchmarks.runner import percentile
+
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'req_per_sec': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 0.50), 3),
+        'p95_ms': round(percentile(latencies, 0.95), 3),
+        'p99_ms': round(percentile(latencies, 0.99), 3),
+    }
+
+
+def scope_for(path):
+    path, _, query = path.partition('?')
+    return {
+        'type': 'http',
+        'method': 'GET',
+        'path': path,
+        'query_string': query.encode(),
+        'headers': [],
+    }
+
+
+def run_wsgi(application, paths, concurrency):
+    """Пул из concurrency потоков, как у многопоточного WSGI-сервера."""
+    from api_yamdb.asgi_bridge import ThreadedASGIHandler
+
+    errors = []
+
+    def request(path):
+        statuses = []
+        started = time.perf_counter()
+        result = application(
+            ThreadedASGIHandler.build_environ(scope_for(path), b''),
+            lambda status, headers, exc_info=None: statuses.append(status)
+        )
+        b''.join(result)
+        result.close()
+        if not statuses[0].startswith('200'):
+            errors.append(path)
+        return (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        latencies = list(executor.map(request, paths))
+    return summary(latencies, time.perf_counter() - started, len(errors))
+
+
+def run_asgi(application, paths, concurrency):
+    """concurrency одновременных клиентов в одном цикле событий."""
+    errors = []
+
+    async def request(path, semaphore):
+        messages = []
+
+        async def receive():
+            return {'type': 'http.request', 'body': b''}
+
+        async def send(message):
+            messages.append(message)
+
+        async with semaphore:
+            started = time.perf_counter()
+            await application(scope_for(path), receive, send)
+            if messages[0]['status'] != 200:
+                errors.append(path)
+            return (time.perf_counter() - started) * 1000
+
+    async def main():
+        semaphore = asyncio.Semaphore(concurrency)
+        return await asyncio.gather(
+            *(request(path, semaphore) for path in paths)
+        )
+
+    started = time.perf_counter()
+    latencies = asyncio.run(main())
+    return summary(latencies, time.perf_counter() - started, len(errors))
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    import django
+    django.setup()
+
+    from django.core.wsgi import get_wsgi_application
+    from django.db import connection, connections
+    from django.test.utils import (
+        override_settings,
+        setup_test_environment,
+        teardown_test_environment
+    )
+
+    from api_yamdb.asgi_bridge import ThreadedASGIHandler
+    from benchmarks.seed import seed_catalogue
+
+    caches = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.dummy.DummyCache'
+        }
+    } if args.no_response_cache else None
+
+    # Потоки открывают свои соединения, поэтому база в файле.
+    directory = tempfile.mkdtemp(prefix='yamdb-bench-')
+    connection.settings_dict['TEST'] = {
+        'NAME': os.path.join(directory, 'bench.sqlite3')
+    }
+    setup_test_environment(debug=False)
+    old_name = connection.creation.create_test_db(
+        verbosity=0, autoclobber=True, serialize=False
+    )
+    try:
+        with override_settings(**({'CACHES': caches} if caches else {})):
+            sizes = seed_catalogue(
+                titles=args.titles,
+                users=args.users,
+                reviews_per_title=args.reviews_per_title,
+                seed=args.seed,
+            )
+            paths = read_paths(args.requests, args.seed)
+            connections.close_all()
+            wsgi = get_wsgi_application()
+            report = {
+                'wsgi': run_wsgi(wsgi, paths, args.concurrency),
+                'asgi': run_asgi(
+                    ThreadedASGIHandler(wsgi, max_workers=args.threads),
+                    paths,
+                    args.concurrency
+                ),
+            }
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+        shutil.rmtree(directory, ignore_errors=True)
+
+    report['config'] = {
+        'dataset': sizes,
+        'requests': args.requests,
+        'concurrency': args.concurrency,
+        'asgi_threads': args.threads,
+        'seed': args.seed,
+        'response_cache': not args.no_response_cache,
+    }
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as report_file:
+            report_file.write(output)
+    print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,175 @@
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT_DIR, 'api_yamdb'))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Замер смешанной нагрузки на общий файл SQLite '
+                    'из нескольких процессов-воркеров.'
+    )
+    parser.add_argument(
+        '--workers', default='1,2,4',
+        help='Числа воркеров через запятую, по фазе на каждое.'
+    )
+    parser.add_argument('--requests-per-worker', type=int, default=300)
+    parser.add_argument(
+        '--profile', default='performance',
+        help='Профиль SQLite из api_yamdb/sqlite.py.'
+    )
+    parser.add_argument('--titles', type=int, default=500)
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--reviews-per-title', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument(
+        '--no-response-cache',
+        action='store_true',
+        help='Отключить кэш ответов, чтобы мерить путь до базы.'
+    )
+    parser.add_argument('--output', help='Файл для JSON-отчёта.')
+    return parser.parse_args(argv)
+
+
+def worker(seed, requests, queue):
+    """Один воркер: своя копия Workload и своё соединение с базой.
+
+    После каждого запроса вызывается close_old_connections, как это
+    делает обработчик WSGI, поэтому CONN_MAX_AGE влияет на результат.
+    """
+    from django.db import OperationalError, close_old_connections
+
+    from benchmarks.runner import DEFAULT_MIX, Workload
+
+    rng = random.Random(seed)
+    workload = Workload(rng)
+    names = [name for name, _ in DEFAULT_MIX]
+    weights = [weight for _, weight in DEFAULT_MIX]
+    latencies = []
+    errors = 0
+    locked = 0
+    for scenario in rng.choices(names, weights, k=requests):
+        started = time.perf_counter()
+        # Тестовый клиент пробрасывает исключения вьюх, которые под
+        # gunicorn стали бы ответами 500.
+        try:
+            if workload.request(scenario).status_code >= 500:
+                errors += 1
+        except OperationalError:
+            locked += 1
+        except Exception:
+            errors += 1
+        finally:
+            close_old_connections()
+        latencies.append((time.perf_counter() - started) * 1000)
+    queue.put({'latencies': latencies, 'errors': errors, 'locked': locked})
+
+
+def run_phase(workers, requests, seed):
+    from django.db import connections
+
+    from benchmarks.runner import percentile
+
+    # Дочерние процессы не должны делить соединение родителя.
+    connections.close_all()
+    context = multiprocessing.get_context('fork')
+    queue = context.Queue()
+    processes = [
+        context.Process(target=worker, args=(seed + number, requests, queue))
+        for number in range(workers)
+    ]
+    started = time.perf_counter()
+    for process in processes:
+        process.start()
+    results = [queue.get() for _ in processes]
+    elapsed = time.perf_counter() - started
+    for process in processes:
+        process.join()
+    latencies = [value for result in results for value in result['latencies']]
+    return {
+        'workers': workers,
+        'requests': len(latencies),
+        'req_per_sec': round(len(latencies) / elapsed, 1),
+        'errors': sum(result['errors'] for result in results),
+        'locked': sum(result['locked'] for result in results),
+        'p50_ms': round(percentile(latencies, 0.50), 3),
+        'p95_ms': round(percentile(latencies, 0.95), 3),
+    }
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    os.environ['SQLITE_PROFILE'] = args.profile
+
+    import django
+    django.setup()
+
+    from django.db import connection
+    from django.test.utils import (
+        override_settings,
+        setup_test_environment,
+        teardown_test_environment
+    )
+
+    from benchmarks.seed import seed_catalogue
+
+    caches = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.dummy.DummyCache'
+        }
+    } if args.no_response_cache else None
+
+    # Воркеры работают с общим файлом, поэтому база не в памяти.
+    directory = tempfile.mkdtemp(prefix='yamdb-bench-')
+    connection.settings_dict['TEST'] = {
+        'NAME': os.path.join(directory, 'bench.sqlite3')
+    }
+    setup_test_environment(debug=False)
+    old_name = connection.creation.create_test_db(
+        verbosity=0, autoclobber=True, serialize=False
+    )
+    try:
+        with override_settings(**({'CACHES': caches} if caches else {})):
+            sizes = seed_catalogue(
+                titles=args.titles,
+                users=args.users,
+                reviews_per_title=args.reviews_per_title,
+                seed=args.seed,
+            )
+            phases = [
+                run_phase(int(workers), args.requests_per_worker, args.seed)
+                for workers in args.workers.split(',')
+            ]
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+        shutil.rmtree(directory, ignore_errors=True)
+
+    report = {
+        'phases': phases,
+        'config': {
+            'dataset': sizes,
+            'profile': args.profile,
+            'requests_per_worker': args.requests_per_worker,
+            'seed': args.seed,
+            'response_cache': not args.no_response_cache,
+        },
+    }
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as report_file:
+            report_file.write(output)
+    print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+import argparse
+import json
+import os
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT_DIR, 'api_yamdb'))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Замер пропускной способности API YaMDb в процессе.'
+    )
+    parser.add_argument('--titles', type=int, default=500)
+    parser.add_argument('--genres', type=int, default=20)
+    parser.add_argument('--categories', type=int, default=5)
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--reviews-per-title', type=int, default=20)
+    parser.add_argument('--comments-per-review', type=int, default=2)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--warmup', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument(
+        '--no-response-cache',
+        action='store_true',
+        help='Отключить кэш ответов, чтобы мерить путь до базы.'
+    )
+    parser.add_argument('--output', help='Файл для JSON-отчёта.')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    import django
+    django.setup()
+
+    from django.db import connection
+    from django.test.utils import (
+        override_settings,
+        setup_test_environment,
+        teardown_test_environment
+    )
+
+    from benchmarks.runner import run_workload
+    from benchmarks.seed import seed_catalogue
+
+    caches = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.dummy.DummyCache'
+        }
+    } if args.no_response_cache else None
+
+    setup_test_environment(debug=False)
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        with override_settings(**({'CACHES': caches} if caches else {})):
+            sizes = seed_catalogue(
+                titles=args.titles,
+                genres=args.genres,
+                categories=args.categories,
+                users=args.users,
+                reviews_per_title=args.reviews_per_title,
+                comments_per_review=args.comments_per_review,
+                seed=args.seed,
+            )
+            report = run_workload(
+                requests=args.requests, seed=args.seed, warmup=args.warmup
+            )
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+    report['config'] = {
+        'dataset': sizes,
+        'requests': args.requests,
+        'seed': args.seed,
+        'response_cache': not args.no_response_cache,
+        'database': connection.vendor,
+    }
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as report_file:
+            report_file.write(output)
+    print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,178 @@
+import random
+import time
+from collections import defaultdict
+
+from django.db import connections
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from reviews.models import Review, Title, User
+
+# Доли запросов, близкие к продуктовому трафику: в основном анонимное чтение.
+DEFAULT_MIX = (
+    ('GET titles list', 35),
+    ('GET titles filtered', 10),
+    ('GET title detail', 15),
+    ('GET reviews list', 18),
+    ('GET comments list', 8),
+    ('GET genres list', 4),
+    ('GET categories list', 4),
+    ('POST review', 4),
+    ('POST comment', 2),
+)
+
+
+class QueryCounter:
+    """Считает SQL-запросы через execute_wrapper без DEBUG."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def percentile(values, share):
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(share * len(ordered)) - 1))
+    return ordered[index]
+
+
+class Workload:
+    """Генерирует запросы сценариев поверх засеянного каталога."""
+
+    def __init__(self, rng):
+        self.rng = rng
+        self.anonymous = APIClient()
+        self.title_ids = list(Title.objects.values_list('id', flat=True))
+        self.reviews = list(Review.objects.values_list('id', 'title_id'))
+        self.genre_slugs = list(
+            Title.genre.through.objects.values_list('genre__slug', flat=True)
+            .distinct()
+        )
+        self.users = list(User.objects.all()[:50])
+        self.clients = {}
+        self.reviewed = set(
+            Review.objects.values_list('author_id', 'title_id')
+        )
+
+    def client_for(self, user):
+        if user.id not in self.clients:
+            client = APIClient()
+            client.credentials(
+                HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}'
+            )
+            self.clients[user.id] = client
+        return self.clients[user.id]
+
+    def page_params(self):
+        return f'limit=5&offset={self.rng.randrange(0, 50, 5)}'
+
+    def request(self, scenario):
+        rng = self.rng
+        if scenario == 'GET titles list':
+            return self.anonymous.get(f'/api/v1/titles/?{self.page_params()}')
+        if scenario == 'GET titles filtered':
+            genre = rng.choice(self.genre_slugs)
+            return self.anonymous.get(
+                f'/api/v1/titles/?genre={genre}&year_min=1950'
+            )
+        if scenario == 'GET title detail':
+            return self.anonymous.get(
+                f'/api/v1/titles/{rng.choice(self.title_ids)}/'
+            )
+        if scenario == 'GET reviews list':
+            return self.anonymous.get(
+                f'/api/v1/titles/{rng.choice(self.title_ids)}/reviews/'
+            )
+        if scenario == 'GET comments list':
+            review_id, title_id = rng.choice(self.reviews)
+            return self.anonymous.get(
+                f'/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+            )
+        if scenario == 'GET genres list':
+            return self.anonymous.get('/api/v1/genres/')
+        if scenario == 'GET categories list':
+            return self.anonymous.get('/api/v1/categories/')
+        if scenario == 'POST review':
+            return self.post_review()
+        if scenario == 'POST comment':
+            review_id, title_id = rng.choice(self.reviews)
+            return self.client_for(rng.choice(self.users)).post(
+                f'/api/v1/titles/{title_id}/reviews/{review_id}/comments/',
+                data={'text': 'Комментарий из бенчмарка'}
+            )
+        raise ValueError(f'Неизвестный сценарий: {scenario}')
+
+    def post_review(self):
+        for _ in range(20):
+            user = self.rng.choice(self.users)
+            title_id = self.rng.choice(self.title_ids)
+            if (user.id, title_id) not in self.reviewed:
+                break
+        self.reviewed.add((user.id, title_id))
+        return self.client_for(user).post(
+            f'/api/v1/titles/{title_id}/reviews/',
+            data={
+                'text': 'Отзыв из бенчмарка',
+                'score': self.rng.randint(1, 10),
+            }
+        )
+
+
+def run_workload(requests=1000, mix=DEFAULT_MIX, seed=0, warmup=50):
+    """Выполняет смесь запросов и возвращает статистику по сценариям."""
+    rng = random.Random(seed)
+    workload = Workload(rng)
+    names = [name for name, _ in mix]
+    weights = [weight for _, weight in mix]
+    for scenario in rng.choices(names, weights, k=warmup):
+        workload.request(scenario)
+
+    latencies = defaultdict(list)
+    queries = defaultdict(int)
+    errors = defaultdict(int)
+    counter = QueryCounter()
+    started = time.perf_counter()
+    for scenario in rng.choices(names, weights, k=requests):
+        counter.count = 0
+        request_started = time.perf_counter()
+        with connections['default'].execute_wrapper(counter):
+            response = workload.request(scenario)
+        latencies[scenario].append(
+            (time.perf_counter() - request_started) * 1000
+        )
+        queries[scenario] += counter.count
+        if response.status_code >= 400:
+            errors[scenario] += 1
+    elapsed = time.perf_counter() - started
+
+    endpoints = {}
+    for scenario, values in sorted(latencies.items()):
+        endpoints[scenario] = {
+            'requests': len(values),
+            'errors': errors[scenario],
+            'req_per_sec': round(len(values) / (sum(values) / 1000), 1),
+            'p50_ms': round(percentile(values, 0.50), 3),
+            'p95_ms': round(percentile(values, 0.95), 3),
+            'p99_ms': round(percentile(values, 0.99), 3),
+            'queries_per_request': round(queries[scenario] / len(values), 2),
+        }
+    all_latencies = [
+        value for values in latencies.values() for value in values
+    ]
+    return {
+        'total': {
+            'requests': requests,
+            'errors': sum(errors.values()),
+            'req_per_sec': round(requests / elapsed, 1),
+            'p50_ms': round(percentile(all_latencies, 0.50), 3),
+            'p95_ms': round(percentile(all_latencies, 0.95), 3),
+            'p99_ms': round(percentile(all_latencies, 0.99), 3),
+            'queries_per_request': round(
+                sum(queries.values()) / requests, 2
+            ),
+        },
+        'endpoints': endpoints,
+    }
@@ -0,0 +1,98 @@
+import random
+
+from django.contrib.auth.hashers import make_password
+
+from reviews.management.commands.rebuild_search_index import (
+    rebuild_title_search_index
+)
+from reviews.management.commands.recount_ratings import recount_ratings
+from reviews.models import (
+    Category, Comment, Genre, GenreTitle, Review, Title, User
+)
+
+
+def seed_catalogue(titles=500, genres=20, categories=5, users=200,
+                   reviews_per_title=20, comments_per_review=2, seed=0):
+    """Создаёт синтетический каталог и возвращает размеры таблиц."""
+    rng = random.Random(seed)
+    password = make_password(None)
+    User.objects.bulk_create(
+        [
+            User(
+                username=f'bench_user_{number}',
+                email=f'bench_user_{number}@yamdb.fake',
+                password=password,
+            )
+            for number in range(users)
+        ]
+    )
+    user_ids = list(
+        User.objects.filter(username__startswith='bench_user_')
+        .values_list('id', flat=True)
+    )
+    category_objects = [
+        Category.objects.create(
+            name=f'Категория {number}', slug=f'bench-category-{number}'
+        )
+        for number in range(categories)
+    ]
+    genre_objects = [
+        Genre.objects.create(
+            name=f'Жанр {number}', slug=f'bench-genre-{number}'
+        )
+        for number in range(genres)
+    ]
+    Title.objects.bulk_create(
+        [
+            Title(
+                name=f'Произведение {number}',
+                year=rng.randint(1900, 2020),
+                description=f'Описание произведения {number}',
+                category=rng.choice(category_objects),
+            )
+            for number in range(titles)
+        ]
+    )
+    title_ids = list(Title.objects.values_list('id', flat=True))
+    GenreTitle.objects.bulk_create(
+        [
+            GenreTitle(title_id=title_id, genre=genre)
+            for title_id in title_ids
+            for genre in rng.sample(genre_objects, min(2, len(genre_objects)))
+        ]
+    )
+    authors_per_title = min(reviews_per_title, len(user_ids))
+    Review.objects.bulk_create(
+        [
+            Review(
+                title_id=title_id,
+                author_id=author_id,
+                text='Синтетический отзыв',
+                score=rng.randint(1, 10),
+            )
+            for title_id in title_ids
+            for author_id in rng.sample(user_ids, authors_per_title)
+        ]
+    )
+    review_ids = list(Review.objects.values_list('id', flat=True))
+    Comment.objects.bulk_create(
+        [
+            Comment(
+                review_id_id=review_id,
+                author_id=rng.choice(user_ids),
+                text='Синтетический комментарий',
+            )
+            for review_id in review_ids
+            for _ in range(comments_per_review)
+        ]
+    )
+    recount_ratings()
+    rebuild_title_search_index()
+    return {
+        'users': len(user_ids),
+        'categories': len(category_objects),
+        'genres': len(genre_objects),
+        'titles': len(title_ids),
+        'reviews': len(review_ids),
+        'comments': Comment.objects.count(),
+    }
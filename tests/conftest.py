@@ -32,5 +32,7 @@ if FILENAME not in project_dir_content:
 assert get_version() < '3.0.0', 'Пожалуйста, используйте версию Django < 3.0.0'
 
 pytest_plugins = [
+    'tests.fixtures.fixture_state',
     'tests.fixtures.fixture_user',
+    'tests.fixtures.fixture_postgres',
 ]
@@ -0,0 +1,37 @@
+import os
+import shutil
+import socket
+import subprocess
+
+import pytest
+
+
+@pytest.fixture(scope='session')
+def postgres_url(tmp_path_factory):
+    """URL одноразового PostgreSQL: из TEST_POSTGRES_URL или кластер,
+    поднятый через initdb/pg_ctl во временном каталоге."""
+    pytest.importorskip('psycopg2')
+    url = os.environ.get('TEST_POSTGRES_URL')
+    if url:
+        yield url
+        return
+    initdb, pg_ctl = shutil.which('initdb'), shutil.which('pg_ctl')
+    if not (initdb and pg_ctl):
+        pytest.skip('PostgreSQL недоступен: задайте TEST_POSTGRES_URL или установите initdb и pg_ctl')
+    data = tmp_path_factory.mktemp('pgdata')
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    started = subprocess.run(
+        [initdb, '-D', str(data), '-U', 'yamdb', '--auth=trust'], capture_output=True
+    ).returncode == 0 and subprocess.run(
+        [pg_ctl, '-D', str(data), '-l', str(data / 'server.log'), '-w',
+         '-o', f'-p {port} -h 127.0.0.1 -k {data}', 'start'],
+        capture_output=True
+    ).returncode == 0
+    if not started:
+        pytest.skip('Не удалось запустить временный PostgreSQL через initdb/pg_ctl')
+    try:
+        yield f'postgres://yamdb@127.0.0.1:{port}/postgres'
+    finally:
+        subprocess.run([pg_ctl, '-D', str(data), '-m', 'immediate', 'stop'], capture_output=True)
@@ -0,0 +1,40 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def clear_jwt_user_cache():
+    from api.authentication import user_cache
+    user_cache.clear()
+    yield
+    user_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def raise_on_query_budget(settings):
+    from api.metrics import registry
+    settings.QUERY_BUDGET_RAISE = True
+    registry.clear()
+    yield
+    registry.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_response_cache():
+    from django.core.cache import cache
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_suggest_index():
+    from api.suggest import suggest_index
+    suggest_index.clear()
+    yield
+    suggest_index.clear()
+
+
+@pytest.fixture(autouse=True)
+def shared_local_cache(settings):
+    # Тесты идут в одном процессе, поэтому локальный кэш в них общий.
+    settings.CACHE_SHARED = True
@@ -1,6 +1,8 @@
 import pytest
 from django.contrib.auth import get_user_model
 
+from api.authentication import UserStateCache
+
 from .common import auth_client, create_users_api
 
 
@@ -571,3 +573,48 @@ class Test01UserAPI:
             'Проверьте, что при PATCH запросе `/api/v1/users/me/`, '
             'пользователь с ролью user не может сменить себе роль'
         )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_12_users_jwt_cache(self, admin_client, user_client, user, django_assert_num_queries):
+        user_client.get('/api/v1/categories/')
+        # и версия ресурса, и список уже в кэше
+        with django_assert_num_queries(0):
+            response = user_client.get('/api/v1/categories/')
+        assert response.status_code == 200, (
+            'Проверьте, что повторный запрос с тем же токеном не обращается к таблице пользователей'
+        )
+        response = user_client.post('/api/v1/categories/', data={'name': 'Фильм', 'slug': 'films'})
+        assert response.status_code == 403
+        admin_client.patch(f'/api/v1/users/{user.username}/', data={'role': 'admin'})
+        response = user_client.post('/api/v1/categories/', data={'name': 'Фильм', 'slug': 'films'})
+        assert response.status_code == 201, (
+            'Проверьте, что изменение роли через `/api/v1/users/{username}/` сбрасывает кэш пользователя'
+        )
+        response = user_client.get('/api/v1/users/me/')
+        assert response.json()['email'] == user.email, (
+            'Проверьте, что `/api/v1/users/me/` возвращает полный профиль пользователя'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_13_users_jwt_cache_invalidated_in_other_workers(self, user_client, user):
+        data = {'name': 'Фильм', 'slug': 'films'}
+        assert user_client.post('/api/v1/categories/', data=data).status_code == 403
+        # Роль меняет другой воркер: его кэш — отдельный объект, общий у
+        # воркеров только кэш Django.
+        other_worker = UserStateCache(max_size=16, ttl=60)
+        get_user_model().objects.filter(pk=user.pk).update(role='admin')
+        other_worker.invalidate(user.pk)
+        response = user_client.post('/api/v1/categories/', data=data)
+        assert response.status_code == 201, (
+            'Проверьте, что смена роли в одном процессе сбрасывает кэш пользователя во всех процессах'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_14_users_jwt_cache_needs_shared_cache(self, user_client, settings, django_assert_num_queries):
+        settings.CACHE_SHARED = False
+        user_client.get('/api/v1/users/me/')
+        with django_assert_num_queries(2):
+            response = user_client.get('/api/v1/users/me/')
+        assert response.status_code == 200, (
+            'Проверьте, что без общего кэша пользователь JWT читается из базы на каждый запрос'
+        )
@@ -249,3 +249,61 @@ class Test04TitleAPI:
         user, moderator = create_users_api(admin_client)
         self.check_permissions(user, 'обычного пользователя', titles, categories, genres)
         self.check_permissions(moderator, 'модератора', titles, categories, genres)
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_titles_list_query_count(self, client, admin_client, django_assert_num_queries):
+        genres = create_genre(admin_client)
+        categories = create_categories(admin_client)
+        for number in range(12):
+            data = {'name': f'Произведение {number}', 'year': 2000 + number,
+                    'genre': [genres[0]['slug'], genres[number % 3]['slug']],
+                    'category': categories[number % 2]['slug']}
+            admin_client.post('/api/v1/titles/', data=data)
+        for url in ('/api/v1/titles/', '/api/v1/titles/?limit=12'):
+            with django_assert_num_queries(3):
+                response = client.get(url)
+            assert response.status_code == 200
+            assert all('genre' in title and 'category' in title and 'rating' in title
+                       for title in response.json()['results']), (
+                f'Проверьте, что при GET запросе `{url}` возвращаются жанры, категория и рейтинг'
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_06_titles_combined_filters(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        url = f'/api/v1/titles/?genre={genres[0]["slug"]}&year=2020'
+        response = client.get(url)
+        assert response.status_code == 200 and response.json()['count'] == 0, (
+            f'Проверьте, что при GET запросе `{url}` фильтры применяются совместно'
+        )
+        url = f'/api/v1/titles/?category={categories[1]["slug"]}&year_min=2010&year_max=2020'
+        response = client.get(url)
+        assert response.status_code == 200 and response.json()['count'] == 1, (
+            f'Проверьте, что при GET запросе `{url}` работает фильтр по диапазону лет'
+        )
+        url = '/api/v1/titles/?genre=unknown'
+        response = client.get(url)
+        assert response.status_code == 200 and response.json()['count'] == 0, (
+            f'Проверьте, что при GET запросе `{url}` с несуществующим жанром возвращается пустой список'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_07_titles_full_text_search(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        url = '/api/v1/titles/?search=главные драмы'
+        response = client.get(url)
+        assert response.status_code == 200, (
+            f'Проверьте, что GET запрос `{url}` возвращает статус 200'
+        )
+        assert [title['id'] for title in response.json()['results']] == [titles[1]['id']], (
+            f'Проверьте, что GET запрос `{url}` ищет по описанию с учётом словоформ'
+        )
+        admin_client.patch(f'/api/v1/titles/{titles[0]["id"]}/', data={'name': 'Главная драма'})
+        response = client.get(url)
+        assert [title['id'] for title in response.json()['results']] == [titles[0]['id'], titles[1]['id']], (
+            'Проверьте, что поиск учитывает изменения и ставит совпадения в названии выше'
+        )
+        admin_client.delete(f'/api/v1/titles/{titles[0]["id"]}/')
+        assert client.get(url).json()['count'] == 1, (
+            'Проверьте, что удалённые произведения пропадают из поиска'
+        )
@@ -1,4 +1,6 @@
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 from .common import (auth_client, create_reviews, create_titles,
                      create_users_api)
@@ -334,3 +336,42 @@ class Test05ReviewAPI:
             'без токена авторизации возвращается статус 401'
         )
         self.check_permissions(user, 'обычного пользователя', reviews, titles)
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_reviews_cursor_pagination(self, client, admin_client, admin):
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/?cursor=&limit=2'
+        response = client.get(url)
+        assert response.status_code == 200, (
+            f'Проверьте, что при GET запросе `{url}` возвращается статус 200'
+        )
+        data = response.json()
+        assert 'count' not in data and len(data['results']) == 2 and data['next'], (
+            f'Проверьте, что при GET запросе `{url}` используется курсорная пагинация без `count`'
+        )
+        received = [review['id'] for review in data['results']]
+        data = client.get(data['next']).json()
+        received += [review['id'] for review in data['results']]
+        assert received == sorted((review['id'] for review in reviews), reverse=True), (
+            'Проверьте, что курсорная пагинация отдаёт отзывы от новых к старым без пропусков и повторов'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_06_review_missing_title_and_duplicate(self, client, admin_client, admin):
+        assert client.get('/api/v1/titles/999/reviews/').status_code == 404, (
+            'Проверьте, что для несуществующего произведения список отзывов возвращает статус 404'
+        )
+        response = admin_client.post('/api/v1/titles/999/reviews/', data={'text': 'a', 'score': 5})
+        assert response.status_code == 404, (
+            'Проверьте, что отзыв к несуществующему произведению возвращает статус 404'
+        )
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        with CaptureQueriesContext(connection) as queries:
+            response = admin_client.post(url, data={'text': 'еще раз', 'score': 7})
+        assert response.status_code == 400, (
+            'Проверьте, что повторный отзыв автора на произведение возвращает статус 400'
+        )
+        assert not [query for query in queries if 'COUNT' in query['sql'] or 'LIMIT 1' in query['sql']], (
+            'Проверьте, что перед созданием отзыва не выполняется проверка exists()'
+        )
@@ -0,0 +1,144 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Category, Review, Title, TitleReviewStats
+from .common import create_reviews
+
+
+class Test08TitleRating:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_rating_follows_orm_writes(self, admin, user):
+        category = Category.objects.create(name='Фильм', slug='films')
+        title = Title.objects.create(name='Проект', year=2020, category=category)
+        first = Review.objects.create(author=admin, title=title, text='a', score=8)
+        Review.objects.create(author=user, title=title, text='b', score=4)
+        title.refresh_from_db()
+        assert (title.rating_sum, title.rating_count, title.rating) == (12, 2, 6), (
+            'Проверьте, что при создании отзыва обновляется сохранённый рейтинг произведения'
+        )
+
+        first.score = 2
+        first.save()
+        title.refresh_from_db()
+        assert (title.rating_sum, title.rating_count, title.rating) == (6, 2, 3), (
+            'Проверьте, что при изменении оценки обновляется сохранённый рейтинг произведения'
+        )
+
+        Review.objects.all().delete()
+        title.refresh_from_db()
+        assert (title.rating_sum, title.rating_count, title.rating) == (0, 0, None), (
+            'Проверьте, что при удалении отзывов рейтинг произведения сбрасывается'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_recount_ratings_command(self, admin, user):
+        title = Title.objects.create(name='Проект', year=2020)
+        Review.objects.create(author=admin, title=title, text='a', score=10)
+        Review.objects.create(author=user, title=title, text='b', score=5)
+        Title.objects.update(rating_sum=0, rating_count=0, rating=None)
+
+        call_command('recount_ratings')
+        title.refresh_from_db()
+        assert (title.rating_sum, title.rating_count, title.rating) == (15, 2, 7.5), (
+            'Проверьте, что команда `recount_ratings` восстанавливает рейтинг по отзывам'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_top_and_rating_ordering(self, client, admin_client, admin):
+        reviews, titles, user, moderator = create_reviews(admin_client, admin)
+        for author in (admin, user):
+            Review.objects.create(author=author, title_id=titles[1]['id'], text='a', score=9)
+        response = client.get('/api/v1/titles/?ordering=-rating')
+        assert [title['id'] for title in response.json()['results']] == [titles[1]['id'], titles[0]['id']], (
+            'Проверьте, что GET запрос `/api/v1/titles/?ordering=-rating` сортирует по рейтингу'
+        )
+        response = client.get('/api/v1/titles/top/?limit=1')
+        assert response.status_code == 200 and [title['id'] for title in response.json()] == [titles[1]['id']], (
+            'Проверьте, что `/api/v1/titles/top/` возвращает произведения с наибольшим рейтингом'
+        )
+        response = client.get(f'/api/v1/titles/top/?genre={titles[0]["genre"][0]}')
+        assert [title['id'] for title in response.json()] == [titles[0]['id']], (
+            'Проверьте, что `/api/v1/titles/top/` можно отфильтровать по жанру'
+        )
+        response = client.get('/api/v1/titles/top/', HTTP_IF_NONE_MATCH=response['ETag'])
+        assert response.status_code == 304
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_weighted_rating(self, admin, user, moderator):
+        single = Title.objects.create(name='Один голос', year=2020)
+        popular = Title.objects.create(name='Популярное', year=2020)
+        Review.objects.create(author=admin, title=single, text='a', score=10)
+        for author in (admin, user, moderator):
+            Review.objects.create(author=author, title=popular, text='a', score=8)
+
+        call_command('recount_weighted_ratings', min_votes=2)
+        single.refresh_from_db()
+        popular.refresh_from_db()
+        mean = 34 / 4
+        assert single.weighted_rating == pytest.approx((1 * 10 + 2 * mean) / 3)
+        assert popular.weighted_rating == pytest.approx((3 * 8 + 2 * mean) / 5)
+        assert single.rating - single.weighted_rating > abs(popular.rating - popular.weighted_rating), (
+            'Проверьте, что взвешенный рейтинг сильнее тянет к среднему произведения с малым числом оценок'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_unrated_titles_sorted_last(self, client):
+        unrated = Title.objects.create(name='Без оценок', year=2020)
+        low = Title.objects.create(name='Слабое', year=2020)
+        high = Title.objects.create(name='Сильное', year=2020)
+        Title.objects.filter(id=low.id).update(rating=3.0, weighted_rating=3.0)
+        Title.objects.filter(id=high.id).update(rating=9.0, weighted_rating=9.0)
+
+        for field in ('rating', 'weighted_rating'):
+            with CaptureQueriesContext(connection) as queries:
+                response = client.get(f'/api/v1/titles/?ordering=-{field}')
+            sql = [query['sql'] for query in queries.captured_queries if 'ORDER BY' in query['sql']][0]
+            assert [title['id'] for title in response.json()['results']] == [high.id, low.id, unrated.id], (
+                f'Проверьте, что при `?ordering=-{field}` произведения без оценок идут последними'
+            )
+            if connection.vendor == 'sqlite':
+                with connection.cursor() as cursor:
+                    cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+                    plan = ' '.join(str(row) for row in cursor.fetchall())
+                assert 'USE TEMP B-TREE FOR ORDER BY' not in plan, (
+                    f'Проверьте, что сортировка `?ordering=-{field}` идёт по индексу'
+                )
+            response = client.get(f'/api/v1/titles/?ordering={field}')
+            assert [title['id'] for title in response.json()['results']] == [unrated.id, low.id, high.id], (
+                f'Проверьте, что при `?ordering={field}` произведения без оценок идут первыми'
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_06_rating_on_bulk_and_cascade_delete(self, admin, user, moderator):
+        first = Title.objects.create(name='Первое', year=2020)
+        second = Title.objects.create(name='Второе', year=2020)
+        for title in (first, second):
+            for author, score in ((admin, 2), (user, 4), (moderator, 9)):
+                Review.objects.create(author=author, title=title, text='a', score=score)
+
+        with CaptureQueriesContext(connection) as queries:
+            Review.objects.exclude(author=moderator).delete()
+        updates = [query['sql'] for query in queries.captured_queries
+                   if query['sql'].startswith('UPDATE "reviews_title"')]
+        assert len(updates) == 2, (
+            'Проверьте, что при удалении нескольких отзывов рейтинг каждого '
+            'произведения пересчитывается одним запросом, а не на каждый отзыв'
+        )
+        for title in (first, second):
+            title.refresh_from_db()
+            assert (title.rating_sum, title.rating_count, title.rating) == (9, 1, 9)
+            assert TitleReviewStats.objects.get(title=title).histogram[9] == 1
+            assert TitleReviewStats.objects.get(title=title).histogram[2] == 0
+
+        with CaptureQueriesContext(connection) as queries:
+            first.delete()
+        assert not [query for query in queries.captured_queries
+                    if query['sql'].startswith('UPDATE "reviews_title')], (
+            'Проверьте, что при удалении произведения рейтинг и гистограмма '
+            'не пересчитываются для каждого его отзыва'
+        )
+        second.refresh_from_db()
+        assert second.rating_count == 1
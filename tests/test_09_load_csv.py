@@ -0,0 +1,36 @@
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Category, Comment, Genre, Review, Title, User
+
+
+class Test09LoadCSV:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_load_static_data(self):
+        call_command('load_csv', batch_size=10)
+        assert User.objects.count() == 5, (
+            'Проверьте, что команда `load_csv` загружает пользователей'
+        )
+        assert (Category.objects.count(), Genre.objects.count()) == (3, 15), (
+            'Проверьте, что команда `load_csv` загружает категории и жанры'
+        )
+        title = Title.objects.get(id=1)
+        assert title.category.slug == 'movie' and title.genre.filter(slug='drama').exists(), (
+            'Проверьте, что команда `load_csv` связывает произведения с категориями и жанрами из файла'
+        )
+        assert title.rating_count == title.score.count() and title.rating is not None, (
+            'Проверьте, что после `load_csv` пересчитывается рейтинг произведений'
+        )
+        assert Review.objects.get(id=1).pub_date.year == 2019, (
+            'Проверьте, что команда `load_csv` сохраняет дату публикации из файла'
+        )
+        assert Comment.objects.count() == 3
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_loaded_titles_are_searchable(self, client):
+        call_command('load_csv')
+        response = client.get('/api/v1/titles/?search=шоушенк')
+        assert [title['id'] for title in response.json()['results']] == [1], (
+            'Проверьте, что после `load_csv` загруженные произведения находятся поиском'
+        )
@@ -0,0 +1,45 @@
+import csv
+import io
+import json
+import os
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+
+from reviews.models import Review
+
+
+class Test10Export:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_export_csv_and_ndjson(self, admin_client):
+        call_command('load_csv')
+        response = admin_client.get('/api/v1/export/review.csv')
+        assert response.status_code == 200 and response.streaming, (
+            'Проверьте, что GET запрос `/api/v1/export/review.csv` отдаёт потоковый ответ'
+        )
+        content = b''.join(response.streaming_content).decode()
+        rows = list(csv.DictReader(io.StringIO(content)))
+        assert len(rows) == Review.objects.count(), (
+            'Проверьте, что выгрузка `/api/v1/export/review.csv` содержит все отзывы'
+        )
+        with open(os.path.join(settings.BASE_DIR, 'static', 'data', 'review.csv'), encoding='utf-8') as source:
+            assert list(rows[0]) == csv.DictReader(source).fieldnames, (
+                'Проверьте, что колонки выгрузки совпадают с файлом static/data/review.csv'
+            )
+        assert rows[0]['pub_date'] == '2019-09-24T21:08:21.567Z'
+
+        response = admin_client.get('/api/v1/export/titles.ndjson')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        assert json.loads(lines[0])['name'] == 'Побег из Шоушенка', (
+            'Проверьте, что `/api/v1/export/titles.ndjson` отдаёт по одному JSON-объекту на строку'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_export_permissions(self, client, user_client, admin_client):
+        assert client.get('/api/v1/export/titles.csv').status_code == 401
+        assert user_client.get('/api/v1/export/titles.csv').status_code == 403, (
+            'Проверьте, что выгрузка доступна только администратору'
+        )
+        assert admin_client.get('/api/v1/export/users.csv').status_code == 404
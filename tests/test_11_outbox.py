@@ -0,0 +1,96 @@
+import uuid
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.utils import timezone
+
+from reviews.models import OutboxEmail
+
+
+class Test11Outbox:
+    url_signup = '/api/v1/auth/signup/'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_signup_queues_email(self, client):
+        data = {'email': 'valid@yamdb.fake', 'username': 'valid_username'}
+        response = client.post(self.url_signup, data=data)
+        assert response.status_code == 200
+        assert len(mail.outbox) == 0 and OutboxEmail.objects.count() == 1, (
+            f'Проверьте, что при POST запросе `{self.url_signup}` письмо ставится в очередь, '
+            f'а не отправляется во время запроса'
+        )
+        call_command('send_outbox')
+        assert len(mail.outbox) == 1 and mail.outbox[0].to == [data['email']], (
+            'Проверьте, что команда `send_outbox` отправляет письма из очереди'
+        )
+        assert not OutboxEmail.objects.filter(sent_at__isnull=True).exists(), (
+            'Проверьте, что отправленные письма помечаются как отправленные'
+        )
+        call_command('send_outbox')
+        assert len(mail.outbox) == 1, 'Проверьте, что письма не отправляются повторно'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_failed_email_is_retried(self, client):
+        client.post(self.url_signup, data={'email': 'valid@yamdb.fake', 'username': 'valid_username'})
+        with mock.patch(
+            'django.core.mail.backends.locmem.EmailBackend.send_messages',
+            side_effect=ConnectionError('smtp down')
+        ):
+            call_command('send_outbox', max_attempts=2)
+        email = OutboxEmail.objects.get()
+        assert (email.attempts, email.sent_at) == (1, None) and 'smtp down' in email.last_error, (
+            'Проверьте, что при ошибке отправки увеличивается счётчик попыток'
+        )
+        call_command('send_outbox', max_attempts=2)
+        assert len(mail.outbox) == 1, 'Проверьте, что письмо отправляется повторно после ошибки'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_claimed_emails_are_skipped(self):
+        for number in range(3):
+            OutboxEmail.objects.create(
+                subject='Код', body='123', from_email='from@yamdb.fake', to=f'user{number}@yamdb.fake'
+            )
+        OutboxEmail.objects.filter(to='user1@yamdb.fake').update(
+            claim=uuid.uuid4(), locked_until=timezone.now() + timedelta(minutes=5)
+        )
+        call_command('send_outbox', batch_size=1)
+        assert sorted(message.to[0] for message in mail.outbox) == ['user0@yamdb.fake', 'user2@yamdb.fake'], (
+            'Проверьте, что `send_outbox` не отправляет письма, захваченные другим обработчиком, '
+            'и продолжает разбирать очередь после них'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_crash_does_not_resend(self):
+        for number in range(2):
+            OutboxEmail.objects.create(
+                subject='Код', body='123', from_email='from@yamdb.fake', to=f'user{number}@yamdb.fake'
+            )
+        send_messages = EmailBackend.send_messages
+        calls = []
+
+        def crash_on_second(backend, messages):
+            calls.append(messages)
+            if len(calls) == 2:
+                raise KeyboardInterrupt
+            return send_messages(backend, messages)
+
+        with mock.patch.object(EmailBackend, 'send_messages', crash_on_second):
+            with pytest.raises(KeyboardInterrupt):
+                call_command('send_outbox')
+        first, second = OutboxEmail.objects.all()
+        assert first.sent_at is not None and second.sent_at is None, (
+            'Проверьте, что письмо помечается отправленным сразу после отправки, а не в конце пачки'
+        )
+        call_command('send_outbox')
+        assert len(mail.outbox) == 1, (
+            'Проверьте, что письма, захваченные упавшим обработчиком, не отправляются до истечения срока захвата'
+        )
+        OutboxEmail.objects.update(locked_until=timezone.now() - timedelta(seconds=1))
+        call_command('send_outbox')
+        assert [message.to[0] for message in mail.outbox] == ['user0@yamdb.fake', 'user1@yamdb.fake'], (
+            'Проверьте, что после истечения срока захвата письмо отправляется, а уже доставленное — нет'
+        )
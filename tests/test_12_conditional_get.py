@@ -0,0 +1,90 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from reviews.models import Genre, ResourceVersion, Title
+from reviews.versions import CATEGORIES, GENRES, TITLES
+from .common import create_reviews
+
+
+class Test12ConditionalGet:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_categories_etag(self, client, admin_client):
+        response = client.get('/api/v1/categories/')
+        etag = response['ETag']
+        assert etag, (
+            'Проверьте, что GET запрос `/api/v1/categories/` возвращает заголовок ETag'
+        )
+        response = client.get('/api/v1/categories/', HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304, (
+            'Проверьте, что при совпадении If-None-Match возвращается статус 304'
+        )
+        admin_client.post('/api/v1/categories/', data={'name': 'Фильм', 'slug': 'films'})
+        response = client.get('/api/v1/categories/', HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200 and response['ETag'] != etag, (
+            'Проверьте, что после создания категории ETag меняется'
+        )
+        etag = response['ETag']
+        admin_client.delete('/api/v1/categories/films/')
+        response = client.get('/api/v1/categories/', HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200 and response.json()['count'] == 0, (
+            'Проверьте, что удаление категории через `/api/v1/categories/{slug}/` меняет ETag'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_titles_etag_follows_reviews(self, client, admin_client, admin):
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        response = client.get(url)
+        etag = response['ETag']
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+        admin_client.patch(f'{url}reviews/{reviews[0]["id"]}/', data={'score': 10})
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200 and response.json()['rating'] == 17 / 3, (
+            'Проверьте, что изменение отзыва меняет ETag произведения'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_version_read_cached(self, client, settings, django_assert_num_queries):
+        etag = client.get('/api/v1/categories/')['ETag']
+        with django_assert_num_queries(0):
+            response = client.get('/api/v1/categories/', HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304, (
+            'Проверьте, что версия ресурса для ETag берётся из кэша без запроса к базе'
+        )
+
+        # Локальный кэш при нескольких воркерах: запись другого процесса
+        # должна быть видна сразу, поэтому версия читается из базы.
+        settings.CACHE_SHARED = False
+        with django_assert_num_queries(1):
+            response = client.get('/api/v1/categories/', HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304, (
+            'Проверьте, что без общего кэша версия ресурса читается одним запросом'
+        )
+        ResourceVersion.objects.create(name=CATEGORIES, version=100, modified=timezone.now())
+        response = client.get('/api/v1/categories/', HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200 and response['ETag'] != etag, (
+            'Проверьте, что без общего кэша запись другого процесса сразу меняет ETag'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_versions_bumped_once_per_transaction(self, admin_client):
+        genre = Genre.objects.create(name='Драма', slug='drama')
+        for number in range(5):
+            Title.objects.create(name=f'Фильм {number}', year=2020).genre.add(genre)
+        before = dict(ResourceVersion.objects.values_list('name', 'version'))
+
+        with CaptureQueriesContext(connection) as queries:
+            response = admin_client.delete('/api/v1/genres/drama/')
+        assert response.status_code == 204
+        updates = [query for query in queries.captured_queries
+                   if query['sql'].startswith('UPDATE "reviews_resourceversion"')]
+        assert len(updates) <= 3, (
+            'Проверьте, что при удалении жанра версии ресурсов увеличиваются '
+            'один раз за транзакцию, а не на каждую удалённую связь'
+        )
+        after = dict(ResourceVersion.objects.values_list('name', 'version'))
+        for name in (GENRES, TITLES):
+            assert after[name] == before[name] + 1
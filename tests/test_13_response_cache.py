@@ -0,0 +1,41 @@
+import pytest
+
+from api.cache import response_cache_stats
+from .common import create_reviews
+
+
+class Test13ResponseCache:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_titles_list_cache(self, client, admin_client, admin, django_assert_num_queries):
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        response = client.get('/api/v1/titles/?year=2000&name=Поворот')
+        assert response['X-Cache'] == 'MISS'
+        with django_assert_num_queries(0):
+            response = client.get('/api/v1/titles/?name=Поворот&year=2000')
+        assert response['X-Cache'] == 'HIT' and response.json()['count'] == 1, (
+            'Проверьте, что повторный GET запрос `/api/v1/titles/` с теми же параметрами '
+            'в другом порядке отдаётся из кэша'
+        )
+        assert response_cache_stats() == {'hits': 1, 'misses': 1}
+
+        admin_client.patch(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/', data={'score': 10}
+        )
+        response = client.get('/api/v1/titles/?year=2000&name=Поворот')
+        assert response['X-Cache'] == 'MISS' and response.json()['results'][0]['rating'] == 17 / 3, (
+            'Проверьте, что изменение отзыва сбрасывает кэш списка произведений'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_genres_list_cache_invalidation(self, client, admin_client):
+        client.get('/api/v1/genres/')
+        admin_client.post('/api/v1/genres/', data={'name': 'Драма', 'slug': 'drama'})
+        response = client.get('/api/v1/genres/')
+        assert response['X-Cache'] == 'MISS' and response.json()['count'] == 1, (
+            'Проверьте, что создание жанра сбрасывает кэш списка жанров'
+        )
+        admin_client.delete('/api/v1/genres/drama/')
+        assert client.get('/api/v1/genres/').json()['count'] == 0, (
+            'Проверьте, что удаление жанра через `/api/v1/genres/{slug}/` сбрасывает кэш'
+        )
@@ -0,0 +1,34 @@
+import pytest
+
+from api.middleware import QueryBudgetExceeded
+from .common import create_titles
+
+
+class Test14Metrics:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_server_timing_and_metrics(self, client, admin_client):
+        create_titles(admin_client)
+        response = client.get('/api/v1/titles/')
+        assert 'db;dur=' in response['Server-Timing'] and 'serialize;dur=' in response['Server-Timing'], (
+            'Проверьте, что ответ содержит заголовок Server-Timing со временем SQL и сериализации'
+        )
+        assert client.get('/api/v1/_metrics/').status_code == 401
+        response = admin_client.get('/api/v1/_metrics/')
+        assert response.status_code == 200
+        endpoint = response.json()['endpoints']['GET title-list']
+        assert endpoint['requests'] == 1 and sum(endpoint['queries']['buckets'].values()) == 1, (
+            'Проверьте, что `/api/v1/_metrics/` возвращает гистограммы по эндпоинтам'
+        )
+        assert 'response_cache' in response.json()
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_query_budget(self, client, admin_client, settings):
+        create_titles(admin_client)
+        settings.QUERY_BUDGETS = {'GET title-list': 1}
+        with pytest.raises(QueryBudgetExceeded):
+            client.get('/api/v1/titles/')
+        settings.QUERY_BUDGET_RAISE = False
+        assert client.get('/api/v1/titles/?year=2000').status_code == 200, (
+            'Проверьте, что без QUERY_BUDGET_RAISE превышение бюджета только пишется в лог'
+        )
@@ -0,0 +1,19 @@
+import pytest
+
+from benchmarks.runner import run_workload
+from benchmarks.seed import seed_catalogue
+
+
+class Test15Benchmarks:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_benchmark_smoke(self):
+        sizes = seed_catalogue(titles=10, genres=3, categories=2, users=5,
+                               reviews_per_title=3, comments_per_review=1)
+        assert sizes['reviews'] == 30 and sizes['comments'] == 30
+        report = run_workload(requests=60, warmup=5)
+        assert report['total']['errors'] == 0, (
+            'Проверьте, что сценарии бенчмарка выполняются без ошибок'
+        )
+        for stats in report['endpoints'].values():
+            assert {'req_per_sec', 'p50_ms', 'p95_ms', 'p99_ms', 'queries_per_request'} <= set(stats)
@@ -0,0 +1,86 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Category, Genre, Review, Title
+
+
+class Test16Suggest:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_prefix_matches(self, client):
+        category = Category.objects.create(name='Фильм', slug='films')
+        Genre.objects.create(name='Фэнтези', slug='fantasy')
+        title = Title.objects.create(name='Побег из Шоушенка', year=1994, category=category)
+        Title.objects.create(name='Форрест Гамп', year=1994, category=category)
+
+        response = client.get('/api/v1/suggest/?q=ф')
+        assert response.status_code == 200, (
+            'Проверьте, что `/api/v1/suggest/` доступен без авторизации'
+        )
+        names = [item['name'] for item in response.json()['results']]
+        assert sorted(names) == ['Фильм', 'Форрест Гамп', 'Фэнтези'], (
+            'Проверьте, что подсказки ищут по префиксу без учёта регистра '
+            'среди жанров, категорий и произведений'
+        )
+
+        response = client.get('/api/v1/suggest/?q=шоу')
+        assert response.json()['results'] == [
+            {'type': 'title', 'name': 'Побег из Шоушенка', 'id': title.id}
+        ], 'Проверьте, что подсказки находят префикс слова внутри названия'
+
+        response = client.get('/api/v1/suggest/?q=ф&limit=1')
+        assert len(response.json()['results']) == 1, (
+            'Проверьте, что параметр `limit` ограничивает число подсказок'
+        )
+        assert client.get('/api/v1/suggest/').json()['results'] == [], (
+            'Проверьте, что без параметра `q` подсказок нет'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_no_queries_and_refresh_on_write(self, client):
+        Genre.objects.create(name='Драма', slug='drama')
+        client.get('/api/v1/suggest/?q=д')
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get('/api/v1/suggest/?q=др')
+        assert len(response.json()['results']) == 1
+        assert len(queries) == 0, (
+            'Проверьте, что подсказки отдаются из памяти без запросов к БД'
+        )
+
+        Genre.objects.create(name='Детектив', slug='detective')
+        Genre.objects.filter(slug='drama').delete()
+        response = client.get('/api/v1/suggest/?q=д')
+        assert [item['slug'] for item in response.json()['results']] == ['detective'], (
+            'Проверьте, что индекс подсказок обновляется после записи'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_no_rebuild_on_review_write(self, client, admin, settings):
+        settings.SUGGEST_CHECK_INTERVAL = 0
+        title = Title.objects.create(name='Драйв', year=2011)
+        client.get('/api/v1/suggest/?q=д')
+
+        Review.objects.create(title=title, author=admin, text='Отлично', score=9)
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get('/api/v1/suggest/?q=др')
+        assert len(response.json()['results']) == 1
+        sql = ' '.join(query['sql'] for query in queries.captured_queries)
+        assert 'reviews_title' not in sql, (
+            'Проверьте, что запись отзыва не перестраивает индекс подсказок'
+        )
+
+        Title.objects.filter(pk=title.pk).update(name='Драйвер')
+        title.refresh_from_db()
+        title.save(update_fields=['year'])
+        with CaptureQueriesContext(connection) as queries:
+            client.get('/api/v1/suggest/?q=др')
+        assert 'reviews_title' not in ' '.join(query['sql'] for query in queries.captured_queries), (
+            'Проверьте, что индекс перестраивается только при изменении названий'
+        )
+        title.save(update_fields=['name'])
+        response = client.get('/api/v1/suggest/?q=др')
+        assert response.json()['results'][0]['name'] == 'Драйвер', (
+            'Проверьте, что изменение названия обновляет индекс подсказок'
+        )
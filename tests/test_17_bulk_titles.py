@@ -0,0 +1,100 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Category, Genre, GenreTitle, Title
+
+
+def create_catalogue():
+    Category.objects.create(name='Фильм', slug='films')
+    Category.objects.create(name='Книга', slug='books')
+    Genre.objects.create(name='Драма', slug='drama')
+    Genre.objects.create(name='Комедия', slug='comedy')
+
+
+class Test17BulkTitles:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_bulk_create(self, client, user_client, admin_client):
+        create_catalogue()
+        data = [
+            {
+                'name': f'Произведение {number}', 'year': 2000 + number,
+                'genre': ['drama', 'comedy'], 'category': 'films'
+            }
+            for number in range(20)
+        ]
+        response = user_client.post('/api/v1/titles/bulk/', data=data, format='json')
+        assert response.status_code == 403, (
+            'Проверьте, что пакетно создавать произведения может только администратор'
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            response = admin_client.post('/api/v1/titles/bulk/', data=data, format='json')
+        assert response.status_code == 201, (
+            'Проверьте, что POST запрос `/api/v1/titles/bulk/` возвращает статус 201'
+        )
+        result = response.json()
+        assert [item['name'] for item in result] == [item['name'] for item in data], (
+            'Проверьте, что в ответе возвращаются созданные произведения в порядке запроса'
+        )
+        assert {genre['slug'] for genre in result[0]['genre']} == {'drama', 'comedy'}
+        assert Title.objects.count() == 20 and GenreTitle.objects.count() == 40, (
+            'Проверьте, что создаются произведения и их связи с жанрами'
+        )
+        inserts = [query for query in queries if query['sql'].startswith('INSERT')]
+        assert len(inserts) <= 3, (
+            'Проверьте, что произведения и связи с жанрами вставляются пакетами'
+        )
+        response = client.get('/api/v1/titles/?search=произведение')
+        assert response.json()['count'] == 20, (
+            'Проверьте, что пакетно созданные произведения попадают в поисковый индекс'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_bulk_errors_by_item(self, admin_client):
+        create_catalogue()
+        data = [
+            {'name': 'Верное', 'year': 2000, 'genre': ['drama'], 'category': 'films'},
+            {'name': 'Неверное', 'year': 2000, 'genre': ['horror'], 'category': 'songs'},
+            {'name': 'Без года', 'genre': [], 'category': 'films'},
+        ]
+        response = admin_client.post('/api/v1/titles/bulk/', data=data, format='json')
+        assert response.status_code == 400
+        errors = response.json()
+        assert len(errors) == 3 and errors[0] == {}, (
+            'Проверьте, что ошибки возвращаются списком по позициям элементов'
+        )
+        assert set(errors[1]) == {'genre', 'category'} and set(errors[2]) == {'year'}
+        assert Title.objects.count() == 0, (
+            'Проверьте, что при ошибке в одном элементе ничего не записывается'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_bulk_update(self, client, admin_client):
+        create_catalogue()
+        title = Title.objects.create(name='Старое', year=2000, category=Category.objects.get(slug='films'))
+        title.genre.set([Genre.objects.get(slug='drama')])
+        etag = client.get('/api/v1/titles/')['ETag']
+        data = [
+            {'id': title.id, 'name': 'Новое', 'year': 2001, 'genre': ['comedy'], 'category': 'books'},
+            {'name': 'Другое', 'year': 2002, 'genre': ['drama'], 'category': 'films'},
+        ]
+        response = admin_client.post('/api/v1/titles/bulk/', data=data, format='json')
+        assert response.status_code == 201
+        title.refresh_from_db()
+        assert (title.name, title.year, title.category.slug) == ('Новое', 2001, 'books'), (
+            'Проверьте, что элементы с `id` обновляют существующие произведения'
+        )
+        assert list(title.genre.values_list('slug', flat=True)) == ['comedy'], (
+            'Проверьте, что при обновлении заменяются жанры произведения'
+        )
+        assert client.get('/api/v1/titles/')['ETag'] != etag, (
+            'Проверьте, что пакетная запись меняет ETag списка произведений'
+        )
+        response = admin_client.post(
+            '/api/v1/titles/bulk/', data=[{**data[0], 'id': 999}], format='json'
+        )
+        assert response.status_code == 400 and 'id' in response.json()[0], (
+            'Проверьте, что обновление несуществующего произведения возвращает ошибку'
+        )
@@ -0,0 +1,51 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Review, Title, TitleReviewStats
+
+
+class Test18ReviewStats:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_stats(self, client, admin, user, moderator):
+        title = Title.objects.create(name='Проект', year=2020)
+        response = client.get(f'/api/v1/titles/{title.id}/reviews/stats/')
+        assert response.status_code == 200, (
+            'Проверьте, что GET запрос `/api/v1/titles/{title_id}/reviews/stats/` возвращает статус 200'
+        )
+        assert response.json()['count'] == 0 and response.json()['median'] is None
+
+        Review.objects.create(author=admin, title=title, text='a', score=2)
+        Review.objects.create(author=user, title=title, text='b', score=9)
+        review = Review.objects.create(author=moderator, title=title, text='c', score=3)
+        with CaptureQueriesContext(connection) as queries:
+            data = client.get(f'/api/v1/titles/{title.id}/reviews/stats/').json()
+        assert len(queries) == 1, (
+            'Проверьте, что статистика оценок читается одним запросом'
+        )
+        assert (data['count'], data['mean'], data['median']) == (3, 14 / 3, 3), (
+            'Проверьте, что возвращаются количество, среднее и медиана оценок'
+        )
+        assert data['histogram']['2'] == 1 and data['histogram']['10'] == 0
+
+        review.score = 10
+        review.save()
+        Review.objects.filter(author=admin).delete()
+        data = client.get(f'/api/v1/titles/{title.id}/reviews/stats/').json()
+        assert (data['count'], data['median']) == (2, 9.5), (
+            'Проверьте, что статистика обновляется при изменении и удалении отзывов'
+        )
+        assert client.get('/api/v1/titles/999/reviews/stats/').status_code == 404
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_recount(self, admin, user):
+        title = Title.objects.create(name='Проект', year=2020)
+        Review.objects.create(author=admin, title=title, text='a', score=5)
+        Review.objects.create(author=user, title=title, text='b', score=5)
+        TitleReviewStats.objects.all().delete()
+        call_command('recount_ratings')
+        assert TitleReviewStats.objects.get(title=title).histogram[5] == 2, (
+            'Проверьте, что команда recount_ratings пересобирает гистограммы оценок'
+        )
@@ -0,0 +1,69 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Comment, Review, Title
+from .common import create_comments
+
+
+class Test19CommentsSummary:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_comments_summary(self, client, admin_client, admin):
+        comments, reviews, titles, _, _ = create_comments(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+
+        data = client.get(url).json()['results']
+        assert 'comments_count' not in data[0], (
+            'Проверьте, что без `?include=comments_summary` сводка по комментариям не выводится'
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(f'{url}?include=comments_summary')
+        assert response.status_code == 200
+        assert len(queries) <= 4, (
+            'Проверьте, что число комментариев и последний комментарий '
+            'получаются без отдельного запроса на каждый отзыв'
+        )
+        by_id = {review['id']: review for review in response.json()['results']}
+        first = by_id[reviews[0]['id']]
+        assert first['comments_count'] == 3, (
+            'Проверьте, что `comments_count` содержит число комментариев к отзыву'
+        )
+        assert first['latest_comment']['text'] == comments[-1]['text'], (
+            'Проверьте, что `latest_comment` содержит последний комментарий к отзыву'
+        )
+        assert first['latest_comment']['author'] == comments[-1]['author']
+        other = by_id[reviews[1]['id']]
+        assert (other['comments_count'], other['latest_comment']) == (0, None)
+
+        response = client.get(f'{url}{reviews[0]["id"]}/?include=comments_summary')
+        assert response.json()['comments_count'] == 3, (
+            'Проверьте, что сводка по комментариям доступна и для отдельного отзыва'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_latest_comment_by_pub_date(self, client, admin):
+        title = Title.objects.create(name='Проект', year=2020)
+        review = Review.objects.create(title=title, author=admin, text='Отзыв', score=7)
+        newer = Comment.objects.create(review_id=review, author=admin, text='новый')
+        older = Comment.objects.create(review_id=review, author=admin, text='старый')
+        # Как после load_csv: даты из файла не совпадают с порядком id.
+        Comment.objects.filter(id=older.id).update(pub_date=newer.pub_date - timedelta(days=1))
+
+        url = f'/api/v1/titles/{title.id}/reviews/?include=comments_summary'
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url)
+        assert response.json()['results'][0]['latest_comment']['text'] == 'новый', (
+            'Проверьте, что последний комментарий выбирается по дате публикации'
+        )
+        comment_queries = [
+            query['sql'] for query in queries.captured_queries
+            if query['sql'].startswith('SELECT "reviews_comment"')
+        ]
+        assert len(comment_queries) == 1 and '"reviews_comment"."id" IN (' in comment_queries[0], (
+            'Проверьте, что последние комментарии страницы отзывов читаются одним '
+            'запросом по id, выбранным подзапросом для каждого отзыва'
+        )
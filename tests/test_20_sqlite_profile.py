@@ -0,0 +1,47 @@
+import pytest
+from django.db import connections
+from django.db.backends.sqlite3.base import DatabaseWrapper
+
+
+class Test20SqliteProfile:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_performance_pragmas(self, settings, tmp_path):
+        from api_yamdb.sqlite import SQLITE_PROFILES
+
+        settings.SQLITE_PRAGMAS = SQLITE_PROFILES['performance']
+        settings_dict = dict(connections['default'].settings_dict)
+        settings_dict['NAME'] = str(tmp_path / 'profile.sqlite3')
+        wrapper = DatabaseWrapper(settings_dict)
+        try:
+            with wrapper.cursor() as cursor:
+                values = {}
+                for name in ('journal_mode', 'synchronous', 'temp_store', 'busy_timeout', 'cache_size'):
+                    cursor.execute(f'PRAGMA {name}')
+                    values[name] = cursor.fetchone()[0]
+        finally:
+            wrapper.close()
+        assert values == {
+            'journal_mode': 'wal',
+            'synchronous': 1,
+            'temp_store': 2,
+            'busy_timeout': 5000,
+            'cache_size': -65536,
+        }, 'Проверьте, что профиль performance выставляет PRAGMA при открытии соединения'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_default_profile(self, settings, tmp_path):
+        settings.SQLITE_PRAGMAS = {}
+        wrapper = DatabaseWrapper({
+            **connections['default'].settings_dict,
+            'NAME': str(tmp_path / 'default.sqlite3'),
+        })
+        try:
+            with wrapper.cursor() as cursor:
+                cursor.execute('PRAGMA journal_mode')
+                journal_mode = cursor.fetchone()[0]
+        finally:
+            wrapper.close()
+        assert journal_mode == 'delete', (
+            'Проверьте, что профиль по умолчанию не меняет настройки SQLite'
+        )
@@ -0,0 +1,87 @@
+import sqlite3
+
+import pytest
+from django.db import connections
+
+from reviews.models import Category
+
+
+@pytest.fixture
+def replica(settings, tmp_path):
+    """Вторая база SQLite — копия основной на момент вызова фикстуры."""
+    default = connections['default']
+    default.ensure_connection()
+    path = str(tmp_path / 'replica.sqlite3')
+    target = sqlite3.connect(path)
+    default.connection.backup(target)
+    target.close()
+    connections.databases['replica'] = {**default.settings_dict, 'NAME': path, 'TEST': {}}
+    settings.REPLICA_DATABASES = ['replica']
+    yield 'replica'
+    connections['replica'].close()
+    del connections['replica']
+    del connections.databases['replica']
+
+
+class Test22Replicas:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_reads_from_replica_writes_to_primary(self, request, client, admin_client, settings):
+        Category.objects.create(name='Фильм', slug='films')
+        request.getfixturevalue('replica')
+        Category.objects.create(name='Книга', slug='books')
+        settings.PRIMARY_STICKY_SECONDS = 60
+
+        response = client.get('/api/v1/categories/')
+        assert [item['slug'] for item in response.json()['results']] == ['films'], (
+            'Проверьте, что анонимные GET запросы читают данные с реплики'
+        )
+
+        response = admin_client.post('/api/v1/categories/', data={'name': 'Музыка', 'slug': 'music'})
+        assert response.status_code == 201, (
+            'Проверьте, что запись идёт в основную базу'
+        )
+        assert Category.objects.using('replica').filter(slug='music').count() == 0
+        assert Category.objects.using('default').filter(slug='music').count() == 1
+
+        response = admin_client.get('/api/v1/categories/')
+        assert response.json()['count'] == 3, (
+            'Проверьте, что после записи чтения пользователя закрепляются за основной базой'
+        )
+        response = client.get('/api/v1/categories/')
+        assert response.json()['count'] == 1, (
+            'Проверьте, что закрепление за основной базой касается только писавшего пользователя'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_chooser(self, settings):
+        from api.replicas import ReplicaChooser
+
+        settings.REPLICA_DATABASES = ['replica_1', 'replica_2']
+        chooser = ReplicaChooser()
+        assert [chooser.acquire() for _ in range(3)] == ['replica_1', 'replica_2', 'replica_1'], (
+            'Проверьте, что по умолчанию реплики выбираются по кругу'
+        )
+        settings.REPLICA_CHOICE = 'least_loaded'
+        chooser = ReplicaChooser()
+        first = chooser.acquire()
+        second = chooser.acquire()
+        assert {first, second} == {'replica_1', 'replica_2'}, (
+            'Проверьте, что least_loaded выбирает реплику с наименьшим числом запросов в работе'
+        )
+        chooser.release(second)
+        assert chooser.acquire() == second
+
+    def test_03_replicas_require_shared_cache(self, settings):
+        from api.checks import check_replica_sticky_cache
+
+        settings.REPLICA_DATABASES = ['replica_1']
+        settings.CACHE_SHARED = False
+        assert [error.id for error in check_replica_sticky_cache(None)] == ['api.E001'], (
+            'Проверьте, что реплики с локальным кэшем не проходят системную проверку'
+        )
+        settings.CACHE_SHARED = True
+        assert check_replica_sticky_cache(None) == []
+        settings.CACHE_SHARED = False
+        settings.REPLICA_DATABASES = []
+        assert check_replica_sticky_cache(None) == []
@@ -0,0 +1,163 @@
+import asyncio
+import json
+import threading
+
+import pytest
+from django.core.wsgi import get_wsgi_application
+
+from api_yamdb.asgi_bridge import ThreadedASGIHandler
+from reviews.models import Category, Title
+
+
+def call_asgi(app, method, path, body=b'', headers=(), query_string=b''):
+    messages = []
+    incoming = [{'type': 'http.request', 'body': body, 'more_body': False}]
+
+    async def receive():
+        return incoming.pop(0)
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        'type': 'http',
+        'method': method,
+        'path': path,
+        'query_string': query_string,
+        'headers': [(name.encode(), value.encode()) for name, value in headers],
+    }
+    asyncio.run(app(scope, receive, send))
+    start = messages[0]
+    chunks = [message['body'] for message in messages[1:]]
+    return start['status'], dict(start['headers']), chunks
+
+
+class Test23Asgi:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_asgi_serves_api(self, token_admin):
+        app = ThreadedASGIHandler(get_wsgi_application(), max_workers=2)
+        category = Category.objects.create(name='Фильм', slug='films')
+        Title.objects.create(name='Проект', year=2020, category=category)
+
+        status, headers, chunks = call_asgi(app, 'GET', '/api/v1/titles/', query_string=b'year=2020')
+        assert status == 200, (
+            'Проверьте, что ASGI-приложение отдаёт GET `/api/v1/titles/`'
+        )
+        assert json.loads(b''.join(chunks))['count'] == 1
+        assert headers[b'content-type'].startswith(b'application/json')
+
+        auth = ('authorization', f'Bearer {token_admin["access"]}')
+        body = json.dumps({'name': 'Книга', 'slug': 'books'}).encode()
+        status, _, _ = call_asgi(
+            app, 'POST', '/api/v1/categories/', body=body,
+            headers=(auth, ('content-type', 'application/json'))
+        )
+        assert status == 201, (
+            'Проверьте, что ASGI-приложение передаёт тело и заголовки запроса'
+        )
+        assert Category.objects.filter(slug='books').exists()
+
+        status, _, chunks = call_asgi(app, 'GET', '/api/v1/export/titles.ndjson', headers=(auth,))
+        assert status == 200 and len([chunk for chunk in chunks if chunk]) >= 1, (
+            'Проверьте, что потоковые ответы отдаются через ASGI по частям'
+        )
+        assert json.loads(b''.join(chunks).splitlines()[0])['name'] == 'Проект'
+
+    def test_02_lifespan(self):
+        app = ThreadedASGIHandler(lambda environ, start_response: [], max_workers=1)
+        messages = []
+        incoming = [{'type': 'lifespan.startup'}, {'type': 'lifespan.shutdown'}]
+
+        async def receive():
+            return incoming.pop(0)
+
+        async def send(message):
+            messages.append(message['type'])
+
+        asyncio.run(app({'type': 'lifespan'}, receive, send))
+        assert messages == ['lifespan.startup.complete', 'lifespan.shutdown.complete']
+
+    def test_03_worker_released_when_send_fails(self):
+        closed = threading.Event()
+
+        class Stream:
+            def __iter__(self):
+                for _ in range(100):
+                    yield b'x' * 10
+
+            def close(self):
+                closed.set()
+
+        def stream(environ, start_response):
+            start_response('200 OK', [('Content-Type', 'text/plain')])
+            return Stream()
+
+        app = ThreadedASGIHandler(stream, max_workers=1)
+        scope = {'type': 'http', 'method': 'GET', 'path': '/', 'headers': []}
+
+        async def receive():
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+        async def send(message):
+            if message['type'] == 'http.response.body':
+                raise ConnectionResetError('клиент отключился')
+
+        async def serve():
+            # Цикл событий сервера продолжает работать после ошибки запроса.
+            with pytest.raises(ConnectionResetError):
+                await app(scope, receive, send)
+            loop = asyncio.get_running_loop()
+            released = await loop.run_in_executor(None, closed.wait, 5)
+            free = await asyncio.wait_for(asyncio.wrap_future(app.executor.submit(lambda: True)), 5)
+            return released, free
+
+        released, free = asyncio.run(serve())
+        assert released, (
+            'Проверьте, что после ошибки отправки поток прекращает отдавать ответ и закрывает его'
+        )
+        assert free, 'Проверьте, что после ошибки отправки поток возвращается в пул'
+
+    def test_04_shutdown_does_not_block_running_requests(self):
+        started = threading.Event()
+
+        def stream(environ, start_response):
+            start_response('200 OK', [('Content-Type', 'text/plain')])
+            started.set()
+            return (b'x' for _ in range(50))
+
+        app = ThreadedASGIHandler(stream, max_workers=1)
+        scope = {'type': 'http', 'method': 'GET', 'path': '/', 'headers': []}
+        chunks = []
+        lifespan = []
+
+        async def receive():
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+        async def send(message):
+            if message['type'] == 'http.response.body':
+                # Медленный клиент: очередь ответа успевает заполниться.
+                await asyncio.sleep(0.01)
+                chunks.append(message['body'])
+
+        async def receive_shutdown():
+            return {'type': 'lifespan.shutdown'}
+
+        async def send_lifespan(message):
+            lifespan.append(message['type'])
+
+        async def serve():
+            request = asyncio.ensure_future(app(scope, receive, send))
+            await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+            await app({'type': 'lifespan'}, receive_shutdown, send_lifespan)
+            await request
+
+        server = threading.Thread(target=asyncio.run, args=(serve(),), daemon=True)
+        server.start()
+        server.join(10)
+        assert not server.is_alive(), (
+            'Проверьте, что lifespan.shutdown не блокирует цикл событий, '
+            'пока потоки дописывают ответы'
+        )
+        assert lifespan == ['lifespan.shutdown.complete']
+        assert len(chunks) == 51
@@ -0,0 +1,76 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import create_titles
+
+
+class Test24SparseFields:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_fields(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get('/api/v1/titles/?fields=id,name')
+        assert response.status_code == 200
+        data = response.json()['results']
+        assert all(set(title) == {'id', 'name'} for title in data), (
+            'Проверьте, что `?fields=` оставляет в ответе только перечисленные поля'
+        )
+        sql = ' '.join(query['sql'] for query in queries.captured_queries)
+        assert '"description"' not in sql, (
+            'Проверьте, что столбцы неперечисленных полей не читаются из базы'
+        )
+        assert 'reviews_genre' not in sql and 'genre_title' not in sql, (
+            'Проверьте, что жанры не загружаются, если поле `genre` не запрошено'
+        )
+
+        response = client.get('/api/v1/titles/?fields=id,genre,category')
+        by_id = {title['id']: title for title in response.json()['results']}
+        title = by_id[titles[0]['id']]
+        assert (set(title['genre']), title['category']) == (
+            set(titles[0]['genre']), titles[0]['category']
+        ), (
+            'Проверьте, что без `?expand=` жанры и категория выводятся слагами'
+        )
+
+        response = client.get(f'/api/v1/titles/{titles[1]["id"]}/?fields=name,year')
+        assert response.json() == {'name': titles[1]['name'], 'year': titles[1]['year']}, (
+            'Проверьте, что `?fields=` работает и для отдельного произведения'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_expand(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(
+                '/api/v1/titles/?fields=id,genre,category&expand=genre,category'
+            )
+        assert response.status_code == 200
+        by_id = {title['id']: title for title in response.json()['results']}
+        title = by_id[titles[1]['id']]
+        assert title['category'] == categories[1], (
+            'Проверьте, что `?expand=category` выводит категорию объектом'
+        )
+        assert title['genre'] == [genres[2]], (
+            'Проверьте, что `?expand=genre` выводит жанры объектами'
+        )
+        assert len(queries) <= 4, (
+            'Проверьте, что раскрытые связи загружаются без запроса на каждое произведение'
+        )
+
+        response = client.get('/api/v1/titles/')
+        assert response.json()['results'][0]['category'] in categories, (
+            'Проверьте, что без `?fields=` ответ не меняется'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_unknown(self, client, admin_client):
+        create_titles(admin_client)
+        for query in ('fields=id,secret', 'fields=id&expand=author'):
+            response = client.get(f'/api/v1/titles/?{query}')
+            assert response.status_code == 400, (
+                f'Проверьте, что `?{query}` с неизвестным полем возвращает статус 400'
+            )
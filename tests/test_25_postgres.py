@@ -0,0 +1,53 @@
+import pytest
+from django.db import connection
+
+from reviews.models import Title
+
+from .common import create_titles
+
+pytestmark = pytest.mark.skipif(
+    connection.vendor != 'postgresql',
+    reason='Проверки для PostgreSQL: запустите с DATABASE_URL=postgres://...'
+)
+
+
+class Test25Postgres:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_search_index_migrated(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT indexdef FROM pg_indexes WHERE indexname = 'title_search_idx'")
+            row = cursor.fetchone()
+        assert row is not None and 'USING gin' in row[0], (
+            'Проверьте, что миграция 0009 создаёт GIN-индекс для поиска на PostgreSQL'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_search_and_ordering(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        response = client.get('/api/v1/titles/?search=главные драмы')
+        assert [title['id'] for title in response.json()['results']] == [titles[1]['id']], (
+            'Проверьте, что поиск на PostgreSQL учитывает словоформы'
+        )
+        Title.objects.filter(id=titles[0]['id']).update(rating=8.0)
+        Title.objects.filter(id=titles[1]['id']).update(rating=9.0)
+        for ordering, expected in (
+            ('name', [titles[0]['id'], titles[1]['id']]),
+            ('-year', [titles[1]['id'], titles[0]['id']]),
+            ('-rating', [titles[1]['id'], titles[0]['id']]),
+        ):
+            response = client.get(f'/api/v1/titles/?ordering={ordering}')
+            assert [title['id'] for title in response.json()['results']] == expected, (
+                f'Проверьте сортировку `?ordering={ordering}` на PostgreSQL'
+            )
+
+        unrated = Title.objects.create(name='Без оценок', year=2021)
+        for ordering, expected in (
+            ('-rating', [titles[1]['id'], titles[0]['id'], unrated.id]),
+            ('rating', [unrated.id, titles[0]['id'], titles[1]['id']]),
+        ):
+            response = client.get(f'/api/v1/titles/?ordering={ordering}')
+            assert [title['id'] for title in response.json()['results']] == expected, (
+                f'Проверьте, что при `?ordering={ordering}` на PostgreSQL произведения без оценок '
+                f'стоят там же, где на SQLite'
+            )